@@ -0,0 +1,339 @@
+#!/usr/bin/env python3
+"""Benchmarks for the hot paths, run on the files in `data/`.
+
+Every case reports the best wall time of a few repeats, throughput in
+graphs (or codes) per second and peak memory traced by `tracemalloc` in a
+separate run. Results can be stored as JSON and compared to a baseline,
+cases slower than the baseline by more than the tolerance are flagged and
+make the script exit with status 1.
+
+Usage:
+    python3 benchmark.py [ --repeat N ] [ --output FILE ]
+                         [ --baseline FILE ] [ --tolerance T ] [ CASE ... ]
+
+CASE arguments select cases whose name contains any of them.
+"""
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from collections.abc import Callable
+from pathlib import Path
+import networkx
+import cli
+
+DATA = Path(__file__).resolve().parent.parent / "data"
+HELP = (
+    f"Usage: {sys.argv[0]} [ --repeat N ] [ --output FILE ]"
+    " [ --baseline FILE ] [ --tolerance T ] [ CASE ... ]"
+)
+
+# a case prepares its input and returns the timed function and item count
+Case = Callable[[], tuple[Callable[[], object], int]]
+CASES: dict[str, Case] = {}
+
+
+def case(name: str) -> Callable[[Case], Case]:
+    def register(f: Case) -> Case:
+        CASES[name] = f
+        return f
+    return register
+
+
+def _lines(file_name: str, copies: int = 1) -> list[str]:
+    with open(DATA / file_name, "r") as f:
+        return f.readlines() * copies
+
+
+def _plc(file_name: str) -> list[dict[int, list[int]]]:
+    from benzenoids.planar_code import read_plc
+    return list(read_plc(str(DATA / file_name)))
+
+
+@case("parse_g6_tree15")
+def _parse_g6():
+    from benzenoids import benparse as bp
+    lines = _lines("tree15.g6")
+
+    def run():
+        for ids in bp.group_by_order(lines).values():
+            bp.from_g6_batch([lines[i] for i in ids])
+    return run, len(lines)
+
+
+@case("parse_g6_networkx_tree15")
+def _parse_g6_nx():
+    from benzenoids import benparse as bp
+    lines = _lines("tree15.g6")
+    return lambda: [bp.from_g6(s) for s in lines], len(lines)
+
+
+@case("parse_plc_b7")
+def _parse_plc():
+    from benzenoids.planar_code import PlanarCode
+    path = str(DATA / "b7.plc")
+
+    def run():
+        for _ in PlanarCode(path, index=False):
+            pass
+    return run, len(PlanarCode(path, index=False))
+
+
+@case("zagreb_tree15")
+def _zagreb():
+    from indexes import zagreb
+    lines = _lines("tree15.g6")
+    return lambda: zagreb.zagreb_lines(lines, ".g6"), len(lines)
+
+
+@case("degree_tree15")
+def _degree():
+    from indexes import degree
+    lines = _lines("tree15.g6")
+    return lambda: degree.degree_lines(lines, ".g6"), len(lines)
+
+
+@case("wiener_tree15")
+def _wiener_tree():
+    from indexes import wiener
+    lines = _lines("tree15.g6")
+    return lambda: wiener.wiener_lines(lines, ".g6"), len(lines)
+
+
+@case("wiener_general_tree15")
+def _wiener_general():
+    from indexes import wiener
+    lines = _lines("tree15.g6")
+    return lambda: wiener.wiener_lines(lines, ".g6", general=True), len(lines)
+
+
+@case("wiener_cubic14")
+def _wiener_cubic():
+    from indexes import wiener
+    lines = _lines("cubic14.g6")
+    return lambda: wiener.wiener_lines(lines, ".g6"), len(lines)
+
+
+@case("wiener_bec_6fb")
+def _wiener_bec():
+    from indexes import wiener
+    lines = _lines("6fb.bec")
+    return lambda: wiener.wiener_lines(lines, ".bec"), len(lines)
+
+
+@case("symmetry_6fb")
+def _symmetry():
+    from benzenoids import benzenoid_symmetry as bs
+    codes = [s.strip() for s in _lines("6fb.bec", copies=200)]
+    return lambda: [bs.point_group(c) for c in codes], len(codes)
+
+
+@case("canonical_g6_cubic14")
+def _canonical():
+    import canonical
+    lines = [s.strip() for s in _lines("cubic14.g6")]
+    return lambda: [canonical.canonical_g6(s) for s in lines], len(lines)
+
+
+@case("dedup_store_6fb")
+def _dedup():
+    import canonical
+    import hashstore
+    codes = [s.strip() for s in _lines("6fb.bec", copies=200)]
+
+    def run():
+        keys = hashstore.digest(canonical.canonical_bec(c) for c in codes)
+        hashstore.HashSet().add_many(keys)
+    return run, len(codes)
+
+
+@case("kekule_enumerate_b7")
+def _kekule_enumerate():
+    import kekule
+    graphs = [networkx.Graph(g) for g in _plc("b7.plc")]
+
+    def run():
+        for g in graphs:
+            for _ in kekule.iter_kekule_structures(g):
+                pass
+    return run, len(graphs)
+
+
+@case("kekule_count_b7")
+def _kekule_count():
+    import kekule
+    plc = _plc("b7.plc")
+    graphs = [(networkx.Graph(g), g) for g in plc]
+    return lambda: [kekule.kekule_count(g, r) for g, r in graphs], len(graphs)
+
+
+@case("dual_b7")
+def _dual():
+    from benzenoids import all_benzenoid
+    plc = _plc("b7.plc")
+    return lambda: [all_benzenoid.dual_rotation(g) for g in plc], len(plc)
+
+
+@case("dual_batched_b7")
+def _dual_batched():
+    from benzenoids import darts
+    path = str(DATA / "b7.plc")
+    return lambda: list(darts.iter_duals(path)), sum(1 for _ in darts.iter_duals(path))
+
+
+@case("inner_dual_b7")
+def _inner_dual():
+    from benzenoids import all_benzenoid
+    path = str(DATA / "b7.plc")
+    return lambda: list(all_benzenoid.iter_benzenoids(path)), 81
+
+
+@case("clar_fries_b4")
+def _clar():
+    from benzenoids import clar
+    lines = [line for line in _lines("b4.bec") if line.strip()]
+    return lambda: list(clar.solve_file(str(DATA / "b4.bec"))), len(lines)
+
+
+@case("clar_fries_cached_6fb")
+def _clar_cached():
+    import os
+    import tempfile
+    import resultcache
+    from benzenoids import clar
+    path = str(DATA / "6fb.bec")
+    cache = os.path.join(tempfile.mkdtemp(), "clar.db")
+
+    def run():
+        # only this case uses the cache, the others run without it
+        resultcache.enable(cache)
+        try:
+            return list(clar.solve_file(path))
+        finally:
+            del os.environ[resultcache.ENV]
+
+    run()  # the timed runs are lookups in a warm cache
+    return run, len([line for line in _lines("6fb.bec") if line.strip()])
+
+
+@case("queens_count_10")
+def _queens_count():
+    import queens
+    return lambda: queens.count_nqueens(10), 1
+
+
+@case("spectrum_cubic14")
+def _spectrum():
+    import eigen_values
+    from benzenoids import benparse as bp
+    graphs = [bp.from_g6(s) for s in _lines("cubic14.g6")]
+    return lambda: [eigen_values.eigs(g) for g in graphs], len(graphs)
+
+
+@case("spectral_invariants_tree15")
+def _invariants():
+    import eigen_values
+    lines = _lines("tree15.g6")
+    return lambda: eigen_values.invariants_g6(lines), len(lines)
+
+
+@case("parse_writegraph3d_n100")
+def _parse_writegraph3d():
+    from benzenoids.writegraph3d import WriteGraph3D
+    graphs = WriteGraph3D(str(DATA / "fulereni_n100_D2d.txt"), index=False)
+    return lambda: list(graphs), len(graphs)
+
+
+@case("fullerene_layout_n100")
+def _fullerene_layout():
+    import fulereni
+    graphs = fulereni.load_fullerenes(str(DATA / "fulereni_n100_D2d.txt"))
+    return lambda: [fulereni.get_coordinates(g, 2, 3, 4) for g in graphs], len(graphs)
+
+
+@case("homo_lumo_acene400")
+def _homo_lumo():
+    import spectral
+    from benzenoids import benparse as bp
+    a = spectral.from_edges(*bp.from_bec_edges("5" + "2" * 398 + "5" + "2" * 398))
+    return lambda: spectral.homo_lumo(a), 1
+
+
+def measure(name: str, repeat: int) -> dict[str, float]:
+    """Runs one case, returns its best time, throughput and peak memory."""
+    run, items = CASES[name]()
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    run()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "seconds": best,
+        "items": items,
+        "per_second": items / best if best > 0 else float("inf"),
+        "peak_kib": peak / 1024,
+    }
+
+
+def compare(
+    results: dict[str, dict], baseline: dict[str, dict], tolerance: float
+) -> list[str]:
+    """Returns names of cases slower than the baseline by more than `tolerance`."""
+    slower = []
+    for name, r in results.items():
+        if name not in baseline:
+            continue
+        ratio = r["seconds"] / baseline[name]["seconds"]
+        r["baseline_ratio"] = ratio
+        if ratio > 1 + tolerance:
+            slower.append(name)
+    return slower
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    repeat = cli.pop_option(args, "--repeat", HELP) or 3
+    output = cli.pop_value(args, "--output", HELP)
+    baseline_path = cli.pop_value(args, "--baseline", HELP)
+    tolerance = float(cli.pop_value(args, "--tolerance", HELP) or 0.2)
+
+    names = [n for n in CASES if not args or any(a in n for a in args)]
+    if not names:
+        raise cli.ArgumentError(f"No case matches {args}.", HELP)
+
+    results = {}
+    print(f"{'case':28} {'seconds':>10} {'items/s':>12} {'peak KiB':>10}")
+    for name in names:
+        r = results[name] = measure(name, repeat)
+        print(f"{name:28} {r['seconds']:10.4f} {r['per_second']:12.1f}"
+              f" {r['peak_kib']:10.1f}", flush=True)
+
+    slower = []
+    if baseline_path is not None:
+        with open(baseline_path, "r") as f:
+            baseline = json.load(f)["cases"]
+        slower = compare(results, baseline, tolerance)
+        for name in names:
+            if "baseline_ratio" in results[name]:
+                mark = "  REGRESSION" if name in slower else ""
+                print(f"{name:28} {results[name]['baseline_ratio']:6.2f}x baseline{mark}")
+
+    if output is not None:
+        report = {
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "cases": results,
+        }
+        with open(output, "w") as f:
+            json.dump(report, f, indent=2)
+
+    if slower:
+        sys.exit(1)
@@ -1,101 +1,182 @@
 #!/usr/bin/env python3
+"""Benzenoids of planar_code files (e.g. from CaGe) as hexagon graphs.
+
+The outer face of a benzenoid is its longest face, all the others are
+hexagons. `iter_benzenoids` streams a file and gives for every graph:
+
+- the inner dual: hexagons joined when they share an edge, as rotation
+  arrays in the order of the shared edges around each hexagon,
+- the kind of every hexagon (see `KINDS`),
+- whether the benzenoid is catacondensed (no inner vertices),
+- its BEC, read off the perimeter and made canonical, so the output can
+  be fed to `benzenoid_symmetry.py` and the index tools.
+
+Graphs are processed in batches by `darts.batches`.
+
+Usage (from `bin/`):
+    python3 -m benzenoids.all_benzenoid FILE [ --bec ]
+
+prints `BEC cata|peri KINDS` for every benzenoid, only BECs with --bec.
+"""
 import sys
-import pulp
-
-
-def read_plc(f_name):
-    f_in = open(f_name, 'rb')
-    header = '>>planar_code<<'
-    if f_in.read(len(header)).decode() != header:
-        raise ValueError('missing header')
-    while True:
-        n_byte = f_in.read(1)
-        if len(n_byte) == 0:
-            break  # End of file
-        b_mode = 1
-        n = int.from_bytes(n_byte, byteorder='little', signed=False)
-        if n == 0:
-            b_mode = 2
-            n = int.from_bytes(f_in.read(2), byteorder='little', signed=False)
-        g = {i: [] for i in range(1, n + 1)}
-        for i in range(1, n + 1):
-            while True:
-                neigh = int.from_bytes(f_in.read(b_mode), byteorder='little', signed=False)
-                if neigh == 0:
-                    break
-                g[i].append(neigh)
-        yield g
-    f_in.close()
-
-
-def inverse(dart):
-    u, v = dart
-    return (v, u)
-
-
-def next_in_rotation(rotation, dart):
-    '''Return the next dart around vertex dart[0].'''
-    u, v = dart
-    order = rotation[u]
-    i = order.index(v)
-    return (u, order[(i + 1) % len(order)])
+from collections.abc import Iterator
+from typing import NamedTuple
+import numpy as np
+import canonical
+import cli
+from benzenoids import darts
+from benzenoids.planar_code import Rotation
+
+HELP = f"Usage: {sys.argv[0]} FILE [ --bec ]"
+
+# kinds of hexagons, by the hexagons annelated to them
+KINDS = {
+    "S": "single hexagon (benzene)",
+    "E": "end, one neighbour",
+    "L": "linear, two neighbours on opposite edges",
+    "A": "angular, two neighbours on edges two apart",
+    "B": "branching, three neighbours",
+    "P": "pericondensed, has an inner vertex",
+}
+# kinds of hexagons without inner vertices by the number of neighbours
+_KIND_BY_DEGREE = np.array(["S", "E", "?", "B"])
+# shared edges (bit k for edge k along the hexagon) of linear hexagons
+_LINEAR = np.array([0b001001, 0b010010, 0b100100])
+
+
+class Benzenoid(NamedTuple):
+    bec: str
+    dual: Rotation
+    kinds: str
+    catacondensed: bool
 
 
 def compute_faces(rotation):
-    '''Return a list of faces, each represented as a list of darts (u,v).'''
-    darts = {(u, v) for u in rotation for v in rotation[u]}
+    '''Return a list of faces, each represented as a list of darts (u,v).
+
+    Faces are traced in plain Python: for a single small graph this is
+    several times faster than the NumPy calls of `darts.faces`, which only
+    pay off on the batches of `darts.iter_faces`. Faces and their darts
+    come in the order of `darts.faces` (by smallest dart).
+    '''
+    # the dart that continues a face after the dart (u, v)
+    after = {}
+    for v, order in rotation.items():
+        for i, u in enumerate(order):
+            after[(u, v)] = (v, order[(i + 1) % len(order)])
+
     visited = set()
     faces = []
-
-    for dart in darts:
-        if dart in visited:
-            continue
-        face = []
-        d = dart
-        while d not in visited:
-            visited.add(d)
-            face.append(d)
-            d = next_in_rotation(rotation, inverse(d))
-        faces.append(face)
+    for u in sorted(rotation):
+        for v in rotation[u]:
+            d = (u, v)
+            if d in visited:
+                continue
+            face = []
+            while d not in visited:
+                visited.add(d)
+                face.append(d)
+                d = after[d]
+            faces.append(face)
     return faces
 
 
 def dual_rotation(rotation):
     '''Compute the dual rotation system and outer face index.'''
     faces = compute_faces(rotation)
-    # Number faces 0 ... n-1
-    n_faces = len(faces)
-    outer_face = max(range(n_faces), key=lambda i: len(faces[i]))
-
-    # Map each dart to the face it belongs to
-    dart_to_face = {}
-    for i, face in enumerate(faces):
-        for dart in face:
-            dart_to_face[dart] = i
-
-    # Build dual rotation: each face -> cyclic list of neighboring faces
-    dual = {i: [] for i in range(n_faces)}
-    for i, face in enumerate(faces):
-        for dart in face:
-            inv = inverse(dart)
-            if inv in dart_to_face:
-                neighbor = dart_to_face[inv]
-                dual[i].append(neighbor)
-
+    face_of = {d: i for i, face in enumerate(faces) for d in face}
+    dual = {i: [face_of[(v, u)] for u, v in face] for i, face in enumerate(faces)}
+    outer_face = max(range(len(faces)), key=lambda i: len(faces[i]), default=-1)
     return dual, outer_face
 
 
-if __name__ == '__main__':
-    for g_adj in read_plc(sys.argv[1]):
-        g_dual = dual_rotation(g_adj)
-        # print(g_adj)
-        # print(g_dual)
+def _outer_faces(sizes: np.ndarray, face_offsets: np.ndarray) -> np.ndarray:
+    """Returns the first longest face of every graph of a batch."""
+    if (np.diff(face_offsets) == 0).any():
+        raise ValueError("graph without faces")
+    longest = np.maximum.reduceat(sizes, face_offsets[:-1])
+    graph_of = np.repeat(np.arange(len(longest)), np.diff(face_offsets))
+    candidates = np.flatnonzero(sizes == longest[graph_of])
+    return candidates[np.searchsorted(candidates, face_offsets[:-1])]
+
+
+def _bec(across: np.ndarray) -> str:
+    """BEC from the faces across the perimeter edges, in perimeter order.
+
+    Benzene has a single run of six edges, its BEC is `benparse.BENZENE`.
+    """
+    starts = np.flatnonzero(across != np.roll(across, 1))
+    if len(starts) == 0:
+        return str(len(across))
+    runs = np.diff(np.append(starts, starts[0] + len(across)))
+    return "".join(map(str, runs.tolist()))
+
+
+def benzenoids_of(batch: darts.Batch) -> Iterator[Benzenoid]:
+    """Yields the benzenoids of one batch of `darts.batches`."""
+    d, f, vertex_offsets, _, face_offsets = batch
+    sizes = np.diff(f.indptr)
+    outer = _outer_faces(sizes, face_offsets)
+    is_outer = np.zeros(len(sizes), dtype=bool)
+    is_outer[outer] = True
+    if (sizes[~is_outer] != 6).any():
+        raise ValueError("not a benzenoid: an inner face is not a hexagon")
+
+    # along f.darts: the face of the dart, its position there, the face across
+    face = f.face_of[f.darts]
+    position = np.arange(len(f.darts)) - f.indptr[face]
+    across = f.face_of[d.alpha[f.darts]]
+
+    on_perimeter = np.zeros(len(vertex_offsets) and vertex_offsets[-1], dtype=bool)
+    on_perimeter[d.tail[is_outer[f.face_of]]] = True
+    inner_vertex = ~on_perimeter[d.tail[f.darts]]
+    inner_counts = np.add.reduceat(~on_perimeter, vertex_offsets[:-1]) \
+        if len(on_perimeter) else np.zeros(len(outer), dtype=np.int64)
+
+    # hexagons are numbered by their face without the outer faces before them
+    hexagon = np.cumsum(~is_outer) - 1
+    shared = ~is_outer[face] & ~is_outer[across]
+    inner = ~is_outer[face]
+    degree = np.bincount(face[shared], minlength=len(sizes))
+    mask = np.bincount(face[shared], weights=1 << position[shared],
+                       minlength=len(sizes)).astype(np.int64)
+    peri = np.bincount(face[inner], weights=inner_vertex[inner],
+                       minlength=len(sizes)) > 0
+    kind = _KIND_BY_DEGREE[np.minimum(degree, 3)]
+    kind[degree == 2] = np.where(np.isin(mask[degree == 2], _LINEAR), "L", "A")
+    kind[peri] = "P"
+
+    dual_nbrs = hexagon[across[shared]]
+    dual_counts = np.bincount(hexagon[face[shared]], minlength=int(inner.any() and hexagon[-1] + 1))
+    dual_indptr = np.zeros(len(dual_counts) + 1, dtype=np.int64)
+    np.cumsum(dual_counts, out=dual_indptr[1:])
+    kind = kind[~is_outer]
+
+    for k, o in enumerate(outer.tolist()):
+        ha, hb = face_offsets[k] - k, face_offsets[k + 1] - k - 1
+        a, b = dual_indptr[ha], dual_indptr[hb]
+        yield Benzenoid(
+            bec=canonical.canonical_bec(_bec(across[f.indptr[o]:f.indptr[o + 1]])),
+            dual=(dual_indptr[ha:hb + 1] - a, (dual_nbrs[a:b] - ha).astype(np.int32)),
+            kinds="".join(kind[ha:hb].tolist()),
+            catacondensed=bool(inner_counts[k] == 0),
+        )
+
+
+def iter_benzenoids(f_name: str, batch_size: int = darts.BATCH_SIZE) -> Iterator[Benzenoid]:
+    """Yields every benzenoid of a planar_code file."""
+    for batch in darts.batches(f_name, batch_size):
+        yield from benzenoids_of(batch)
 
-        g_adj2 = dict([i for i in g_adj.items() if i[0] != 1])
 
-        for k, v in g_adj2.items():
-            # k = key, v = value (list of vertices)
-            nv = [i for i in v if i != 1]
-            g_adj2[k] = nv
-
-        print(g_adj2)
+if __name__ == '__main__':
+    args = sys.argv[1:]
+    only_bec = cli.pop_flag(args, "--bec")
+    if len(args) != 1:
+        raise cli.ArgumentError("Expected one planar_code file.", HELP)
+
+    for b in iter_benzenoids(args[0]):
+        if only_bec:
+            print(b.bec)
+        else:
+            print(b.bec, "cata" if b.catacondensed else "peri", b.kinds)
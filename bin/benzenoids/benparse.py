@@ -1,5 +1,14 @@
-"""Module for parsing different benzenoid graph formats into `nx.Graph`"""
+"""Module for parsing different benzenoid graph formats into `nx.Graph`
+
+g6 strings can also be decoded without networkx, straight into NumPy
+adjacency stacks, packed bitmaps, edge arrays or CSR arrays.
+"""
+from functools import lru_cache
 import networkx as nx
+import numpy as np
+from benzenoids.benzenoid_symmetry import BENZENE
+
+G6_HEADER = b">>graph6<<"
 
 
 def from_g6(raw_g6: str) -> nx.Graph:
@@ -10,24 +19,281 @@ def from_g6(raw_g6: str) -> nx.Graph:
     return g
 
 
+def g6_order(g6s: bytes) -> tuple[int, int]:
+    """Returns the order of a g6 graph and the length of its size prefix."""
+    if g6s[0] != 126:
+        return g6s[0] - 63, 1
+    if g6s[1] != 126:
+        return (g6s[1] - 63) << 12 | (g6s[2] - 63) << 6 | (g6s[3] - 63), 4
+    n = 0
+    for c in g6s[2:8]:
+        n = n << 6 | (c - 63)
+    return n, 8
+
+
+@lru_cache(maxsize=None)
+def _g6_pairs(n: int) -> tuple[np.ndarray, np.ndarray]:
+    """Vertex pairs (i, j) in the order their bits appear in a g6 string.
+
+    g6 stores the upper triangle column by column, i.e. x(0,1), x(0,2),
+    x(1,2), x(0,3), ... which is the row-major lower triangle.
+    """
+    j, i = np.tril_indices(n, -1)
+    return i, j
+
+
+def _g6_bits(data: list[bytes]) -> tuple[int, np.ndarray]:
+    """Unpacks g6 strings of the same order into a (B, n(n-1)/2) bit array."""
+    n, k = g6_order(data[0])
+    size = n * (n - 1) // 2
+    width = (size + 5) // 6
+
+    head = data[0][:k]
+    if any(g[:k] != head or len(g) != k + width for g in data):
+        raise ValueError("g6 strings in a batch must have the same order")
+
+    body = b"".join(g[k:] for g in data)
+    words = np.frombuffer(body, dtype=np.uint8).reshape(len(data), width) - 63
+    bits = np.unpackbits(words[:, :, None], axis=2)[:, :, 2:]
+    return n, bits.reshape(len(data), 6 * width)[:, :size]
+
+
+def from_g6_batch(raw_g6s: list[str] | list[bytes]) -> np.ndarray:
+    """Decodes g6 strings of the same order into a (B, n, n) adjacency array.
+
+    Bits are unpacked with NumPy directly, no `nx.Graph` is constructed.
+    """
+    data = [_g6_bytes(s) for s in raw_g6s]
+    if not data:
+        return np.zeros((0, 0, 0), dtype=np.uint8)
+
+    n, bits = _g6_bits(data)
+    i, j = _g6_pairs(n)
+    adj = np.zeros((len(data), n, n), dtype=np.uint8)
+    adj[:, i, j] = bits
+    adj[:, j, i] = bits
+    return adj
+
+
+def from_g6_array(raw_g6: str | bytes) -> np.ndarray:
+    """Decodes a g6 string into an (n, n) adjacency array."""
+    return from_g6_batch([raw_g6])[0]
+
+
+def from_g6_bitmap(raw_g6s: list[str] | list[bytes]) -> np.ndarray:
+    """Decodes g6 strings of the same order into packed adjacency rows.
+
+    Returns a (B, n, ceil(n / 8)) uint8 array, bit `v` of row `u` (big
+    endian within each byte, as `np.packbits`) is set when uv is an edge.
+    """
+    return np.packbits(from_g6_batch(raw_g6s), axis=2)
+
+
+def from_g6_edges(raw_g6: str | bytes) -> tuple[int, np.ndarray]:
+    """Decodes a g6 string into its order and an (m, 2) array of edges u < v."""
+    n, bits = _g6_bits([_g6_bytes(raw_g6)])
+    i, j = _g6_pairs(n)
+    on = bits[0].astype(bool)
+    return n, np.stack([i[on], j[on]], axis=1)
+
+
+def from_g6_csr(raw_g6: str | bytes) -> tuple[np.ndarray, np.ndarray]:
+    """Decodes a g6 string into CSR arrays (indptr, indices).
+
+    Neighbours of `u` are `indices[indptr[u]:indptr[u + 1]]`, sorted.
+    """
+    n, edges = from_g6_edges(raw_g6)
+    src = np.concatenate([edges[:, 0], edges[:, 1]])
+    dst = np.concatenate([edges[:, 1], edges[:, 0]])
+    order = np.lexsort((dst, src))
+    indptr = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(src, minlength=n), out=indptr[1:])
+    return indptr, dst[order]
+
+
+def to_g6(n: int, edges: list[tuple[int, int]]) -> str:
+    """Encodes a graph on vertices 0..n-1 as a g6 string (no header)."""
+    if n < 63:
+        head = [n + 63]
+    elif n < 258048:
+        head = [126, (n >> 12 & 63) + 63, (n >> 6 & 63) + 63, (n & 63) + 63]
+    else:
+        head = [126, 126] + [(n >> s & 63) + 63 for s in range(30, -1, -6)]
+
+    size = n * (n - 1) // 2
+    bits = np.zeros(6 * ((size + 5) // 6), dtype=np.uint8)
+    for u, v in edges:
+        if u > v:
+            u, v = v, u
+        bits[v * (v - 1) // 2 + u] = 1
+    words = bits.reshape(-1, 6) @ np.array([32, 16, 8, 4, 2, 1]) + 63
+    return bytes(head).decode("ascii") + words.astype(np.uint8).tobytes().decode("ascii")
+
+
+def group_by_order(lines: list[str]) -> dict[int, list[int]]:
+    """Groups indexes of g6 lines by the order of their graphs."""
+    groups: dict[int, list[int]] = {}
+    for i, g6s in enumerate(lines):
+        n, _ = g6_order(_g6_bytes(g6s))
+        groups.setdefault(n, []).append(i)
+    return groups
+
+
+def stack_by_order(
+    adjs: list[np.ndarray], batch_size: int | None = None
+) -> list[tuple[list[int], np.ndarray]]:
+    """Groups adjacency arrays by order and stacks every group.
+
+    Returns (indexes into `adjs`, (b, n, n) stack) pairs, groups are split
+    into stacks of at most `batch_size` arrays when it is given.
+    """
+    groups: dict[int, list[int]] = {}
+    for i, a in enumerate(adjs):
+        groups.setdefault(a.shape[0], []).append(i)
+    stacks = []
+    for ids in groups.values():
+        step = batch_size or len(ids)
+        for s in range(0, len(ids), step):
+            chunk = ids[s:s + step]
+            stacks.append((chunk, np.stack([adjs[i] for i in chunk])))
+    return stacks
+
+
+def _g6_bytes(raw_g6: str | bytes) -> bytes:
+    """Strips whitespace and the optional `>>graph6<<` header."""
+    g6s = raw_g6.strip()
+    if isinstance(g6s, str):
+        g6s = g6s.encode("ascii")
+    if g6s.startswith(G6_HEADER):
+        g6s = g6s[len(G6_HEADER):]
+    return g6s
+
+
+Coordinates = tuple[int, int]
+
+# moves along the perimeter, the same as `Benzy.moveset`
+BEC_MOVES: tuple[Coordinates, ...] = ((2, 1), (2, -1), (0, -2), (-2, -1), (-2, 1), (0, 2))
+# vertices of the hexagon centered at (0, 0), clockwise from the upper left;
+# edge k joins vertices k and k + 1 and is the edge walked by move k
+HEX_VERTICES: tuple[Coordinates, ...] = ((-2, 1), (0, 2), (2, 1), (2, -1), (0, -2), (-2, -1))
+# centers of the hexagons sharing edge k with the hexagon centered at (0, 0)
+HEX_NEIGHBOURS: tuple[Coordinates, ...] = tuple(
+    (a[0] + b[0], a[1] + b[1]) for a, b in zip(HEX_VERTICES, HEX_VERTICES[1:] + HEX_VERTICES[:1])
+)
+
+
+def bec_lattice(
+    raw_bec: str,
+) -> tuple[list[Coordinates], list[tuple[int, int]], list[Coordinates]]:
+    """Builds a benzenoid on hexagonal lattice coordinates from a BEC.
+
+    The perimeter is walked clockwise the way `Benzy` does it: each move
+    turns right by one step of `BEC_MOVES` and every digit ends with a
+    turn back by two. The hexagon on the right of a move in direction k
+    from p is centered at p - HEX_VERTICES[k], so every perimeter edge
+    marks a side of a boundary hexagon. Hexagons are then flood-filled
+    across sides that are not on the perimeter, which reaches all inner
+    hexagons, and vertices are indexed by a coordinate dict.
+
+    Returns vertex coordinates (perimeter vertices first, in walk order),
+    0-based edges and hexagon centers. Everything is linear in the number
+    of hexagons.
+    """
+    bec = _check_bec(raw_bec)
+    # a closed clockwise walk turns right six times in total, any other
+    # turning number (a counter-clockwise code) would flood-fill forever;
+    # benzene walks its six edges without turning back
+    if bec != BENZENE and sum(map(int, bec)) - 2 * len(bec) != 6:
+        raise ValueError(f"Illegal boundary edges code {bec}: the perimeter is not clockwise.")
+    coords: list[Coordinates] = [(0, 0)]
+    index: dict[Coordinates, int] = {(0, 0): 0}
+    sides: set[tuple[Coordinates, int]] = set()
+    hexagons: dict[Coordinates, None] = {}
+
+    x, y = 0, 0
+    rotation = 0
+    for digit in bec:
+        for _ in range(int(digit)):
+            vx, vy = HEX_VERTICES[rotation]
+            center = (x - vx, y - vy)
+            hexagons.setdefault(center)
+            sides.add((center, rotation))
+            dx, dy = BEC_MOVES[rotation]
+            x, y = x + dx, y + dy
+            rotation = (rotation + 1) % 6
+            if (x, y) not in index:
+                index[(x, y)] = len(coords)
+                coords.append((x, y))
+        rotation = (rotation - 2) % 6
+
+    if (x, y) != (0, 0) or len(coords) != sum(map(int, bec)):
+        raise ValueError(f"Illegal boundary edges code {bec}: the perimeter does not close.")
+
+    queue = list(hexagons)
+    for cx, cy in queue:
+        for k, (nx_, ny) in enumerate(HEX_NEIGHBOURS):
+            if ((cx, cy), k) in sides:
+                continue
+            center = (cx + nx_, cy + ny)
+            if center not in hexagons:
+                hexagons[center] = None
+                queue.append(center)
+
+    edges: set[tuple[int, int]] = set()
+    for cx, cy in hexagons:
+        ring = []
+        for vx, vy in HEX_VERTICES:
+            c = (cx + vx, cy + vy)
+            if c not in index:
+                index[c] = len(coords)
+                coords.append(c)
+            ring.append(index[c])
+        for u, v in zip(ring, ring[1:] + ring[:1]):
+            edges.add((u, v) if u < v else (v, u))
+
+    return coords, sorted(edges), list(hexagons)
+
+
 def from_bec(raw_bec: str) -> nx.Graph:
-    """Creates a `nx.Graph.` from a BEC string."""
-    bec: str = _check_bec(raw_bec)
-    perimiter_vertices: int = sum(int(d) for d in bec)
+    """Creates a `nx.Graph.` of the whole benzenoid from a BEC string.
+
+    Perimeter vertices are numbered 1..p in walk order, inner vertices follow.
+    """
+    return bec_to_benzenoid(raw_bec)[0]
+
+
+def bec_to_benzenoid(raw_bec: str) -> tuple[nx.Graph, dict[int, Coordinates]]:
+    """Creates a `nx.Graph.` from a BEC string together with its vertex coordinates."""
+    coords, edges, _ = bec_lattice(raw_bec)
     g: nx.Graph = nx.Graph()
+    g.add_nodes_from(range(1, len(coords) + 1))
+    g.add_edges_from((u + 1, v + 1) for u, v in edges)
+    return g, {i + 1: c for i, c in enumerate(coords)}
 
-    g.add_edges_from([(i, i + 1) for i in range(1, perimiter_vertices)])
-    g.add_edge(perimiter_vertices, 1)  # connect the nx.Graph
 
-    return g
+def from_bec_edges(raw_bec: str) -> tuple[int, np.ndarray]:
+    """Decodes a BEC into its order and an (m, 2) array of 0-based edges."""
+    coords, edges, _ = bec_lattice(raw_bec)
+    return len(coords), np.array(edges, dtype=np.int64).reshape(-1, 2)
+
+
+def from_bec_array(raw_bec: str) -> np.ndarray:
+    """Decodes a BEC into an (n, n) adjacency array, vertices as in `from_bec`."""
+    n, edges = from_bec_edges(raw_bec)
+    adj = np.zeros((n, n), dtype=np.uint8)
+    adj[edges[:, 0], edges[:, 1]] = 1
+    adj[edges[:, 1], edges[:, 0]] = 1
+    return adj
 
 
 def _check_bec(raw_bec: str) -> str:
     """Makes sure the provided BEC is valid.
 
-    Valid BEC is composed only of numbers between 1-5.
+    Valid BEC is composed only of numbers between 1-5, or is `BENZENE`.
     """
     bec: str = raw_bec.strip()
+    if bec == BENZENE:
+        return bec
 
     try:
         for d in bec:
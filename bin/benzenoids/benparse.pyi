@@ -1,4 +1,29 @@
 import networkx as nx
+import numpy as np
 
+G6_HEADER: bytes
+Coordinates = tuple[int, int]
+BENZENE: str
+BEC_MOVES: tuple[Coordinates, ...]
+HEX_VERTICES: tuple[Coordinates, ...]
+HEX_NEIGHBOURS: tuple[Coordinates, ...]
+
+def bec_lattice(
+    raw_bec: str,
+) -> tuple[list[Coordinates], list[tuple[int, int]], list[Coordinates]]: ...
+def bec_to_benzenoid(raw_bec: str) -> tuple[nx.Graph, dict[int, Coordinates]]: ...
 def from_bec(raw_bec: str) -> nx.Graph: ...
+def from_bec_array(raw_bec: str) -> np.ndarray: ...
+def from_bec_edges(raw_bec: str) -> tuple[int, np.ndarray]: ...
 def from_g6(raw_g6: str) -> nx.Graph: ...
+def from_g6_array(raw_g6: str | bytes) -> np.ndarray: ...
+def from_g6_batch(raw_g6s: list[str] | list[bytes]) -> np.ndarray: ...
+def from_g6_bitmap(raw_g6s: list[str] | list[bytes]) -> np.ndarray: ...
+def from_g6_csr(raw_g6: str | bytes) -> tuple[np.ndarray, np.ndarray]: ...
+def from_g6_edges(raw_g6: str | bytes) -> tuple[int, np.ndarray]: ...
+def group_by_order(lines: list[str]) -> dict[int, list[int]]: ...
+def stack_by_order(
+    adjs: list[np.ndarray], batch_size: int | None = None
+) -> list[tuple[list[int], np.ndarray]]: ...
+def to_g6(n: int, edges: list[tuple[int, int]]) -> str: ...
+def g6_order(g6s: bytes) -> tuple[int, int]: ...
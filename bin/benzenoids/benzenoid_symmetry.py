@@ -1,16 +1,78 @@
 #!/usr/bin/env python3
+import collections
+import multiprocessing
 import sys
+import time
 
 # Mathematical chemistry, 2025/26
 # October 9, 2025
 
 
+# examples printed per point group
+EXAMPLES = 5
+# bytes of input classified by one worker task
+BLOCK_SIZE = 1 << 20
+HELP = f"Usage: {sys.argv[0]} [ FILE ] [ --jobs N ] [ --progress ]"
+# BEC of a single hexagon, its only code with a 6 (see `all_benzenoid`);
+# defined here because this script imports nothing from the repository
+BENZENE = "6"
+
+GROUP_NAME = {
+    (6, True): "D6h",
+    (6, False): "C6h",
+    (3, True): "D3h",
+    (3, False): "C3h",
+    (2, True): "D2h",
+    (2, False): "C2h",
+    (1, True): "C2v",
+    (1, False): "Cs",
+}
+
+
+def least_rotation(bec):
+    """
+    Return the start of the lexicographically minimal cyclic shift,
+    found in linear time with Duval's Lyndon factorization of bec + bec.
+    """
+    s = bec + bec
+    n = len(bec)
+    i = 0
+    start = 0
+    while i < n:
+        start = i
+        j = i + 1
+        k = i
+        while j < 2 * n and s[k] <= s[j]:
+            if s[k] < s[j]:
+                k = i
+            else:
+                k += 1
+            j += 1
+        while i <= k:
+            i += j - k
+    return start
+
+
 def minimum_representation(bec):
     """
-    Return the minimum representation, i.e. lexiconx.Graphically
+    Return the minimum representation, i.e. lexicographically
     minimal string among all cyclic shifts.
     """
-    return min(bec[i:] + bec[:i] for i in range(len(bec)))
+    k = least_rotation(bec)
+    return bec[k:] + bec[:k]
+
+
+def smallest_period(bec):
+    """
+    Return the smallest p > 0 such that shifting bec by p gives bec again
+    (len(bec) when there is none). p always divides len(bec).
+
+    The first occurrence of bec in bec + bec after position 0 is exactly
+    that shift, str.find locates it in linear time.
+    """
+    if not bec:
+        return 0
+    return (bec + bec).find(bec, 1)
 
 
 def has_reflection(bec):
@@ -21,23 +83,33 @@ def has_reflection(bec):
     return minimum_representation(bec) == minimum_representation(bec[::-1])
 
 
+def _rotation_order(n, period):
+    """Largest benzenoid rotation order dividing the number of repeats."""
+    repeats = n // period if period else 1
+    for order in [6, 3, 2]:
+        if repeats % order == 0:
+            return order
+    return 1
+
+
 def order_of_rotation(bec):
     """
     Determine the rotational symmetry order for the
     benzenoid with the given boundary-edges code.
     """
-    for order in [6, 3, 2]:
-        if len(bec) % order != 0:
-            continue
-        t = len(bec) // order
-        valid = True
-        for i in range(1, order):
-            if bec[:t] != bec[i * t : (i + 1) * t]:
-                valid = False
-                break
-        if valid:
-            return order
-    return 1
+    if bec == BENZENE:
+        return 6
+    return _rotation_order(len(bec), smallest_period(bec))
+
+
+def classify(bec):
+    """
+    Return (minimum representation, has reflection, order of rotation)
+    for the given boundary-edges code, computing each part once.
+    """
+    canonical = minimum_representation(bec)
+    mirrored = minimum_representation(bec[::-1])
+    return canonical, canonical == mirrored, order_of_rotation(bec)
 
 
 def point_group(bec):
@@ -45,31 +117,128 @@ def point_group(bec):
     Return the symmetry (point group) for the benzenoid with the given
     boundary-edges code.
     """
-    group_name = {
-        (6, True): "D6h",
-        (6, False): "C6h",
-        (3, True): "D3h",
-        (3, False): "C3h",
-        (2, True): "D2h",
-        (2, False): "C2h",
-        (1, True): "C2v",
-        (1, False): "Cs",
-    }
-    return group_name[order_of_rotation(bec), has_reflection(bec)]
+    _, reflection, order = classify(bec)
+    return GROUP_NAME[order, reflection]
 
 
-if __name__ == "__main__":
-    symmetry = dict()
+def classify_block(data):
+    """
+    Classify all codes in a block of lines. Return the number of codes
+    per point group and the first EXAMPLES codes of each group.
+    """
     freq = dict()
-    for line in sys.stdin:
+    symmetry = dict()
+    for line in data.decode("ascii").split("\n"):
         bec = line.strip()
+        if not bec:
+            continue
         sym = point_group(bec)
-        if sym not in symmetry:
-            symmetry[sym] = []
+        if sym not in freq:
             freq[sym] = 0
+            symmetry[sym] = []
         freq[sym] += 1
-        if len(symmetry[sym]) < 5:
+        if len(symmetry[sym]) < EXAMPLES:
             symmetry[sym].append(bec)
+    return freq, symmetry
+
+
+def read_blocks(f):
+    """
+    Yield chunks of about BLOCK_SIZE bytes from a binary file, each
+    ending at a line boundary.
+    """
+    rest = b""
+    while True:
+        data = f.read(BLOCK_SIZE)
+        if not data:
+            break
+        data = rest + data
+        cut = data.rfind(b"\n") + 1
+        if cut == 0:
+            rest = data
+            continue
+        rest = data[cut:]
+        yield data[:cut]
+    if rest:
+        yield rest
+
+
+def classify_stream(f, jobs=1, progress=False):
+    """
+    Classify codes from a binary file in blocks, in `jobs` processes.
+
+    Blocks are merged in input order, so the counts and the examples are
+    the same as for a serial run. At most 2 * jobs blocks are in flight.
+    """
+    freq = dict()
+    symmetry = dict()
+    done = 0
+    start = time.perf_counter()
+
+    def merge(result):
+        nonlocal done
+        block_freq, block_symmetry = result
+        for sym, count in block_freq.items():
+            if sym not in freq:
+                freq[sym] = 0
+                symmetry[sym] = []
+            freq[sym] += count
+            missing = EXAMPLES - len(symmetry[sym])
+            symmetry[sym].extend(block_symmetry[sym][:missing])
+            done += count
+        if progress:
+            rate = done / max(time.perf_counter() - start, 1e-9)
+            print(f"\r{done} codes, {rate:.0f} codes/s", end="", file=sys.stderr)
+
+    if jobs <= 1:
+        for block in read_blocks(f):
+            merge(classify_block(block))
+    else:
+        with multiprocessing.Pool(jobs) as pool:
+            pending = collections.deque()
+            for block in read_blocks(f):
+                pending.append(pool.apply_async(classify_block, (block,)))
+                if len(pending) >= 2 * jobs:
+                    merge(pending.popleft().get())
+            while pending:
+                merge(pending.popleft().get())
+
+    if progress:
+        print(file=sys.stderr)
+    return freq, symmetry
+
+
+def parse_args(args):
+    """
+    Return (files, jobs, progress) from [ FILE ] [ --jobs N ] [ --progress ].
+    Options are parsed here rather than by the repository's `cli` module,
+    so that the script runs on its own; wrong options exit with the usage.
+    """
+    args = list(args)
+    progress = "--progress" in args
+    args = [a for a in args if a != "--progress"]
+    jobs = 1
+    if "--jobs" in args:
+        i = args.index("--jobs")
+        value = args[i + 1] if i + 1 < len(args) else ""
+        if not value.isdigit() or int(value) < 1:
+            sys.exit(f"Option '--jobs' needs a positive integer value.\n{HELP}")
+        jobs = int(value)
+        del args[i:i + 2]
+    if len(args) > 1 or any(a.startswith("--") for a in args):
+        sys.exit(f"Expected at most one BEC file.\n{HELP}")
+    return args, jobs, progress
+
+
+if __name__ == "__main__":
+    args, jobs, progress = parse_args(sys.argv[1:])
+
+    if args:
+        with open(args[0], "rb") as f:
+            freq, symmetry = classify_stream(f, jobs, progress)
+    else:
+        freq, symmetry = classify_stream(sys.stdin.buffer, jobs, progress)
+
     all_groups = ["D6h", "C6h", "D3h", "C3h", "D2h", "C2h", "C2v", "Cs"]
     for sym in all_groups:
         if sym not in symmetry:
@@ -2,14 +2,15 @@
 
 import math
 import sys
-from pprint import pprint
 import networkx as nx
 import matplotlib.pyplot as plt
+from benzenoids.benzenoid_symmetry import BENZENE
 
 Coordinates = tuple[int, int]
 
 
 class Vertex:
+    __slots__ = ("id", "type", "x", "y")
 
     def __init__(
         self, vx_id: int, coordinates: Coordinates, vx_type: str | None = None
@@ -25,7 +26,11 @@ class Vertex:
 
 
 class Benzy:
-    """Creates a benzenoid system from a BEC that can be plotted."""
+    """Creates a benzenoid system from a BEC that can be plotted.
+
+    Vertices are indexed by their coordinates, so every lookup is a dict
+    access and the whole system is built in time linear in its size.
+    """
 
     x_step = 1
     y_step = 1
@@ -38,15 +43,14 @@ class Benzy:
         (0, 2 * y_step),  # 6, up
     ]
 
-    # NOTE: is it really necessary to work with 2 lists of vertices?
-    # Just use @self.coordinates and create functions for searching
-    # for primary vertices
-    primary_vertices: list[Vertex] = []
-    vertices: list[Vertex] = []
-
-    def __init__(self, bec: str) -> None:
+    def __init__(self, bec: str, verbose: bool = False) -> None:
+        self.verbose: bool = verbose
         self.bec: str = self.check_bec(bec)
         self.perimiter_vertices: int = sum(int(d) for d in self.bec)
+        self.vertices: list[Vertex] = []
+        self.index: dict[Coordinates, Vertex] = {}
+        # primary vertices bucketed by level (their y-coordinate)
+        self.primary_vertices: dict[int, list[Vertex]] = {}
         self.graph: nx.Graph = self.graph_from_bec()
         self.calculate_coordinates()
         self.coordinates: list[Coordinates] = self.get_coordinates()
@@ -58,24 +62,39 @@ class Benzy:
         g.add_edge(self.perimiter_vertices, 1)  # connect the nx.Graph
         return g
 
-    def draw_benzenoid_system(self) -> None:
-        """Plots the benzenoid system."""
+    def log(self, *args, **kwargs) -> None:
+        """Prints a debug message when the system is built verbosely."""
+        if self.verbose:
+            print(*args, **kwargs)
+
+    def draw(self, ax: plt.Axes | None = None, with_labels: bool = True) -> None:
+        """Draws the benzenoid system on `ax` (the current axes by default)."""
+        if ax is None:
+            ax = plt.gca()
         nx.draw(
             G=self.graph,
             pos={vx.id: (vx.x, vx.y) for vx in self.vertices},  # needs a dict
-            with_labels=True,
-            node_size=700,
+            ax=ax,
+            with_labels=with_labels,
+            node_size=700 if with_labels else 60,
             node_color="skyblue",
             font_weight="bold",
         )
-        plt.title(f"Benzenoid system of {self.bec}")
+        ax.set_aspect("equal")
+        ax.set_title(f"Benzenoid system of {self.bec}")
+
+    def draw_benzenoid_system(self) -> None:
+        """Plots the benzenoid system."""
+        self.draw()
         plt.show()
 
     def check_bec(self, bec: str) -> str:
         """Makes sure that the provided BEC is valid.
 
-        Valid BEC is composed only of numbers between 1-5.
+        Valid BEC is composed only of numbers between 1-5, or is `BENZENE`.
         """
+        if bec == BENZENE:
+            return bec
         for d in bec:
             if not d.isdigit():
                 raise ValueError("Illegal boundary edges code. Must be numeric.")
@@ -86,24 +105,20 @@ class Benzy:
     def get_vertex_id(self, coordinates: Coordinates, strict=False) -> int | None:
         """Finds vertex with given coordinates."""
 
-        print(f"searching for {coordinates} ... ", end="")
-        for vx in self.vertices:
-            if (vx.x, vx.y) == coordinates:
-                print(f"found vertex {vx.id}", end="\n")
-                return vx.id
+        self.log(f"searching for {coordinates} ... ", end="")
+        vx = self.index.get(coordinates)
+        if vx is not None:
+            self.log(f"found vertex {vx.id}", end="\n")
+            return vx.id
 
-        print()
+        self.log()
         if not strict:
-            vx = self.vertices[len(self.vertices) - 1]
-            return vx.id + 1  # return next possible vertice id
+            return len(self.vertices) + 1  # return next possible vertice id
         else:
             return (math.inf, math.inf)
 
     def get_vertex(self, coordinates: Coordinates) -> Vertex | None:
-        for vx in self.vertices:
-            if (vx.x, vx.y) == coordinates:
-                return vx
-        return None
+        return self.index.get(coordinates)
 
     def get_coordinates(self) -> list[Coordinates]:
         lst = [(vx.x, vx.y) for vx in self.vertices]
@@ -111,25 +126,23 @@ class Benzy:
 
     def add_vertex(
         self, new_id: int, rotation: int, predecessor: Vertex | None = None
-    ) -> None:
-        """Adds new coordinates to system coordinate dictionary."""
+    ) -> Vertex:
+        """Adds a vertex one move away from its predecessor to the index."""
         if predecessor is None:
-            predecessor = self.vertices[new_id - 1]
+            predecessor = self.vertices[new_id - 2]
         move_step: Coordinates = self.moveset[rotation]
-        new_crd: Coordinates = predecessor.move(move_step)
-        new_vx: Vertex = Vertex(new_id, new_crd)
+        new_vx: Vertex = Vertex(new_id, predecessor.move(move_step))
         self.vertices.append(new_vx)
+        self.index[(new_vx.x, new_vx.y)] = new_vx
+        return new_vx
 
     def find_coordinates(self, coordinates: Coordinates) -> bool:
-        for vx in self.vertices:
-            if coordinates == (vx.x, vx.y):
-                return True
-        return False
+        return coordinates in self.index
 
     def find_edge(self, u: Vertex, v: Vertex) -> bool:
-        print(f"\nSearching edge for {u.id} and {v.id}... ", end="")
+        self.log(f"\nSearching edge for {u.id} and {v.id}... ", end="")
         if self.graph.has_edge(u.id, v.id):
-            print("found edge")
+            self.log("found edge")
             return True
         else:
             return False
@@ -140,7 +153,7 @@ class Benzy:
         Primary vertices (denoted as PN) are vertices that fit 3 criteria:
         (1) their x-coordinate is divisible by 2 and
         (2) their y-coordinate is divisible by 3 and
-        (3) there is a vertex immeadiatelly below them (i.e. (x,y-2))
+        (3) there is an edge to the vertex immeadiatelly below them (i.e. (x,y-2))
 
                           (2,1)
             this --> (0,0)     (4,0) <-- this
@@ -148,32 +161,17 @@ class Benzy:
                      (0,-2)    (4,-2)
                           (2,-3)
 
+        Only boundary edges exist when primary vertices are searched for, so
+        these are the tops of vertical boundary edges.
         """
+        below = self.index.get((vx.x, vx.y - 2))
         return (
-            vx.x % 2 == 0 and vx.y % 3 == 0 and self.find_coordinates((vx.x, vx.y - 2))
+            vx.x % 2 == 0
+            and vx.y % 3 == 0
+            and below is not None
+            and self.find_edge(vx, below)
         )
 
-    def is_inner_primary(self, vx: Vertex) -> bool:
-        move_step: Coordinates = (-2 * self.x_step, self.y_step)
-        return self.find_coordinates(vx.move(move_step))
-
-    def sort_primary_vertices(self) -> None:
-        """Sort PN coordinates descending by y and ascending by x."""
-        n = len(self.primary_vertices)
-        for i in range(n):
-            for j in range(i + 1, n):
-                # descending by y, when y are different
-                if self.primary_vertices[i].y < self.primary_vertices[j].y:
-                    tmp = self.primary_vertices[i]
-                    self.primary_vertices[i] = self.primary_vertices[j]
-                    self.primary_vertices[j] = tmp
-                # ascending by x, when y are the same
-                elif self.primary_vertices[i].y == self.primary_vertices[j].y:
-                    if self.primary_vertices[i].x > self.primary_vertices[j].x:
-                        tmp = self.primary_vertices[i]
-                        self.primary_vertices[i] = self.primary_vertices[j]
-                        self.primary_vertices[j] = tmp
-
     def next_rotation(self, rotation: int):
         """Gets the next valid rotation, moving to the beginning/end of moveset if necessary.
 
@@ -214,118 +212,67 @@ class Benzy:
                 return rotation
 
     def trace_hexagon(self, start_vx: Vertex) -> None:
-        print(f"\nTracing from {start_vx.id}")
+        """Traces the hexagon whose upper left vertex is @start_vx.
+
+        Missing vertices and edges are added, existing ones are looked up
+        in the coordinate index.
+        """
+        self.log(f"\nTracing from {start_vx.id}")
 
         rotation = 0
         cur_vx: Vertex = start_vx
 
         for _ in range(6):
             next_coordinates: Coordinates = cur_vx.move(self.moveset[rotation])
-            next_id: int = self.get_vertex_id(next_coordinates)
-            next_vx: Vertex = Vertex(next_id, next_coordinates)
-
-            if self.find_coordinates(next_coordinates):
-                if not self.find_edge(cur_vx, next_vx):
-                    print(f"* adding edge: {cur_vx.id, next_vx.id}")
-                    self.graph.add_edge(cur_vx.id, next_vx.id)
-            else:
+            next_vx: Vertex | None = self.get_vertex(next_coordinates)
+
+            if next_vx is None:
                 # create new vertex and new edge
-                print(f"* creating new vertex for {next_vx.id} {next_coordinates}")
-                self.graph.add_node(next_id)
-                self.add_vertex(next_vx, rotation, cur_vx)
-                print(f"* adding edge: {(cur_vx.id, next_vx.id)}")
+                next_vx = self.add_vertex(len(self.vertices) + 1, rotation, cur_vx)
+                self.log(f"* creating new vertex for {next_vx.id} {next_coordinates}")
+                self.graph.add_node(next_vx.id)
+            if not self.find_edge(cur_vx, next_vx):
+                self.log(f"* adding edge: {cur_vx.id, next_vx.id}")
                 self.graph.add_edge(cur_vx.id, next_vx.id)
 
-                if self.is_inner_primary(next_vx):
-                    self.primary_vertices.insert(0, next_vx)
-                    self.sort_primary_vertices()  # is this needed?
-
             cur_vx = next_vx
             rotation = self.next_rotation(rotation)
 
-    # BUG: for example 3233321112523242211122
     def fill_me_up(self) -> None:
-        """Fills up the coordinate list with missing edges and vertices
+        """Fills up the system with missing edges and vertices
         ---
         The original list contains only vertices and edges that form the boundary.
-        To fill up the system, it has to go through all primary vertices (check
-        @__is_primary for details) and draws the missing edges.
-
-        The algorithm moves through all levels from top left-most to bottom right-most
-        primary vertex. E.g.:
-
-                             ×
-            from this --> ×     ×
-                          |     |
-                            ...   ...
-                                ×     × <-- to this
-                                |     |
-                                ×     ×
-                                   ×
-
-        It checks if a neighbouring PN exists in this level (i.e. 4x right). In case
-        it does not, but there are still PN's left somewhere in this level, it moves
-        to the next PN. This makes sure, that benzenoid systems with gaps are properly
-        filled. E.g.:
+        Hexagons of the system are arranged in levels, every level is crossed by
+        vertical edges whose tops are primary vertices (check @is_primary for
+        details). Walking a level from left to right, the boundary goes into the
+        system at one vertical boundary edge and leaves it at the next one, so
+        primary vertices of a level, sorted by x, pair up into the spans of
+        hexagons that belong to the system. E.g.:
 
                              ×     ×                      ×     ×
-                start --> 1 --> 2 --> 3 -------------> x --> y --> z --> NULL
-                          |     |     |       ...      |     |     |
+                start --> 1 --> 2     3 -------------> x --> y     z
+                          |  in       |      out       |  in       |
                           ×     ×     ×                ×     ×     ×
-          next run --> 4     5     6     7         ×      ×     ×
-                       |     |     |     |         |      |     |
-                               ...                     ...
-                               ...                     ...
-                               ...                     ...
-                          |     |     |     |     |     |     |
-                          ×     ×     ×     ×     ×     ×      ×
-                       ×     ×     ×     ×     ×     ×      ×     ×
-                       |     |     |     |     |     |      |     |
-                       ×     ×     ×     ×     ×     ×      ×     ×
-                          ×     ×     ×     ×     ×     ×      ×
-
-        Vertex 1 has 2 as it's neighbouring PN, so the hexagon is traced and any missing
-        edges drawn. Moving onto 2, it's neighbouring PN is 3, so the procedure repeats.
-        3 has no neighbouring PN, but the list still contains x, y and z, so it moves to
-        x. When it reaches z, there is no neighbouring PN and no PN's left in this level,
-        so it moves on to PN 4.
-
-        Vertex type is important for determining if boundary primary vertices should be traced.
-        If it's between immeadiate left and right types, it should, otherwise not. E.g.:
+
+        Every span is filled by tracing its hexagons from left to right, each
+        one starting at the upper right vertex of the previous one:
 
                    ×           ×
-                1     2     3     4
+                1     •     •     4
                 |     |     |     |
                 ×     ×     ×     ×
                    ×     ×     ×
-                      ...  ...  ...
 
+        Sorting happens within levels only, so the system is filled in time
+        linear in its size (up to sorting the few primary vertices of a level).
         """
-        print("\nAll Vertices:")
-        [print(n.id, (n.x, n.y)) for n in self.vertices]
-
-        self.sort_primary_vertices()
-        print("\nSorted Primary Vertices:")
-        [print(n.id, (n.x, n.y)) for n in self.primary_vertices]
-
-        while self.primary_vertices is not []:
-            # 1. get vertex from list of primary vertices
-            current_vx: Vertex = self.primary_vertices.pop(0)
-
-            # 2. does a next PN exist in this level?
-            try:
-                # exception will happen here
-                next_vx: Vertex = self.primary_vertices[0]
-                print(f"\nNext PN: {next_vx.id} {(next_vx.x, next_vx.y)}")
-
-                if current_vx.y == next_vx.y:
-                    print(f"PN exists in level, starting trace for {current_vx.id}")
-                    self.trace_hexagon(current_vx)  # trace the hexagon and continue
-                else:
-                    print("PN doesn't exists in level, moving to next level")
-            except IndexError:
-                print("\nNo more primary vertices")
-                break
+        for level in sorted(self.primary_vertices, reverse=True):
+            bucket = sorted(self.primary_vertices[level], key=lambda vx: vx.x)
+            self.log(f"\nLevel {level}: {[vx.id for vx in bucket]}")
+
+            for left, right in zip(bucket[::2], bucket[1::2]):
+                for x in range(left.x, right.x, 4 * self.x_step):
+                    self.trace_hexagon(self.index[(x, level)])
 
     def calculate_coordinates(self) -> None:
         """Calculates coordinates for all vertices.
@@ -349,51 +296,53 @@ class Benzy:
         for more details).
         """
         rotation = 0  # starting rotation
-        id = 1
-        cur_vx = Vertex(id, (0, 0))  # starting vertex
+        cur_vx = Vertex(1, (0, 0))  # starting vertex
         self.vertices.append(cur_vx)  # starting position
+        self.index[(0, 0)] = cur_vx
 
         for digit in self.bec:
             digit = int(digit)
             for _ in range(digit):
-                id += 1
-
-                print(
-                    f"digit: {digit}, vx id: {id}, rotation: {
-                      rotation}, move: {self.moveset[rotation]}"
-                )
+                move = self.moveset[rotation]
+                self.log(f"digit: {digit}, vx id: {len(self.vertices) + 1}, "
+                      f"rotation: {rotation}, move: {move}")
 
-                # add next vertex to list based on rotation
-                next_coordinates = cur_vx.move(self.moveset[rotation])
-                cur_vx = Vertex(id, next_coordinates)
-                self.vertices.append(cur_vx)
+                # add next vertex to list based on rotation, the last move
+                # returns to the starting vertex
+                next_vx = self.get_vertex(cur_vx.move(move))
+                if next_vx is None:
+                    next_vx = self.add_vertex(len(self.vertices) + 1, rotation, cur_vx)
+                cur_vx = next_vx
 
                 rotation = self.next_rotation(rotation)
             rotation -= 2  # store next starting direction
 
-        # pop the last coordinate (it shadows the first vertex)
-        self.vertices.pop(-1)
+        # benzene walks its six edges without turning back
+        closed = self.bec == BENZENE or rotation % 6 == 0
+        if cur_vx.id != 1 or not closed or len(self.vertices) != self.perimiter_vertices:
+            raise ValueError(f"Illegal boundary edges code {self.bec}: the boundary does not close.")
 
         # traverse the coordinates again and find primary vertices on the boundary
         for vx in self.vertices:
             if self.is_primary(vx):
-                self.primary_vertices.append(vx)
+                self.primary_vertices.setdefault(vx.y, []).append(vx)
 
         # add missing edges and vertices to the list
         self.fill_me_up()
 
 
+EXAMPLES = ["55", "2525", "333333", "323232323232"]
+
+
 if __name__ == "__main__":
-    if len(sys.argv) < 2:
-        print("Usage: benzy.py [BEC | list BEC]")
-        print("Examples:", end=" ")
-        for e in ["55", "2525", "333333", "4445312351231", "323232323232"]:
-            print(e, end=" ")
-        print()
-
-    # for b in sys.argv[1:]:
-    #     bs = Benzy(b)
-    #     bs.draw_benzenoid_system()
-
-    bs = Benzy("3233321112523242211122")
-    bs.draw_benzenoid_system()
+    args = sys.argv[1:]
+    verbose = "--verbose" in args
+    becs = [a for a in args if a != "--verbose"]
+    if not becs:
+        print("Usage: benzy.py [ --verbose ] [BEC | list BEC]")
+        print("Examples:", " ".join(EXAMPLES))
+        sys.exit(1)
+
+    for b in becs:
+        bs = Benzy(b, verbose=verbose)
+        bs.draw_benzenoid_system()
@@ -0,0 +1,317 @@
+#!/usr/bin/env python3
+"""Clar and Fries numbers of benzenoids by integer linear programming.
+
+With a binary x_e for every edge and y_h for every hexagon:
+
+- Clar number: maximize sum y_h subject to, for every vertex v,
+  sum of x_e over edges at v + sum of y_h over hexagons at v = 1.
+  Hexagons with y_h = 1 are the sextets of a Clar structure, the x_e = 1
+  edges its double bonds.
+- Fries number: maximize sum y_h subject to sum of x_e at v = 1 (a Kekule
+  structure) and sum of x_e over the edges of h >= 3 y_h (h has three
+  double bonds).
+
+Building a PuLP model from scratch per molecule costs more than solving
+it with CBC. Variables, objectives and problems are therefore kept per
+size (n, m, h) in every process and reused: only the constraints are
+replaced, built directly as `LpAffineExpression`s from index arrays.
+
+Input is a file of BECs or a planar_code file (with BECs read off its
+graphs by `all_benzenoid`). Solves run in a process pool and rows
+`clar fries sextets BEC` are written as they finish, in input order.
+Sextets are hexagon indexes: the order of `benparse.bec_lattice` for
+BECs and of `all_benzenoid` inner duals for planar_code. Benzenoids
+without Kekule structures get `-`.
+
+With `--cache FILE` rows of BEC files are kept in the result cache (see
+`resultcache`) under the canonical BEC, so a benzenoid solved before is
+only looked up, also when it is given by a rotated or mirrored code.
+Sextets are stored in the hexagon order of the canonical BEC and mapped
+to the order of the input code by a lattice symmetry (`hexagon_map`).
+
+Usage (from `bin/`):
+    python3 -m benzenoids.clar FILE [ --jobs N ] [ --cache FILE ]
+"""
+import sys
+from collections.abc import Callable, Iterable, Iterator
+from contextlib import nullcontext
+from multiprocessing import Pool
+from typing import NamedTuple
+import numpy as np
+import pulp
+import canonical
+import cli
+import resultcache
+from benzenoids import all_benzenoid, darts
+from benzenoids import benparse as bp
+from benzenoids.planar_code import PlanarCode
+from indexes import stream
+
+HELP = f"Usage: {sys.argv[0]} FILE [ --jobs N ] [ --cache FILE ]"
+SOLVER = pulp.PULP_CBC_CMD(msg=False)
+# version of the cached results, bump when they change
+CACHE_VERSION = 1
+
+
+class Hexagons(NamedTuple):
+    """A benzenoid as (m, 2) 0-based edges and (h, 6) edges and vertices
+    of its hexagons."""
+    n: int
+    edges: np.ndarray
+    hexagon_edges: np.ndarray
+    hexagon_vertices: np.ndarray
+
+
+class ClarStructure(NamedTuple):
+    number: int
+    sextets: list[int]
+    double_bonds: list[int]
+
+
+def from_bec(raw_bec: str) -> Hexagons:
+    """Builds the hexagons of a benzenoid from its BEC."""
+    coords, edges, centers = bp.bec_lattice(raw_bec)
+    index = {c: i for i, c in enumerate(coords)}
+    edge_index = {e: i for i, e in enumerate(edges)}
+    vertices = [[index[(cx + vx, cy + vy)] for vx, vy in bp.HEX_VERTICES]
+                for cx, cy in centers]
+    hexagon_edges = [[edge_index[(u, v) if u < v else (v, u)]
+                      for u, v in zip(ring, ring[1:] + ring[:1])] for ring in vertices]
+    return Hexagons(
+        len(coords),
+        np.array(edges, dtype=np.int64).reshape(-1, 2),
+        np.array(hexagon_edges, dtype=np.int64).reshape(-1, 6),
+        np.array(vertices, dtype=np.int64).reshape(-1, 6),
+    )
+
+
+def from_rotation(indptr: np.ndarray, nbrs: np.ndarray) -> Hexagons:
+    """Builds the hexagons of a benzenoid from planar_code rotation arrays.
+
+    Hexagons are the faces other than the longest (outer) one, in the
+    order of `darts.faces_of`.
+    """
+    d = darts.darts(indptr, nbrs)
+    f = darts.faces_of(d)
+    sizes = np.diff(f.indptr)
+    outer = int(np.argmax(sizes))
+    if np.delete(sizes, outer).size and (np.delete(sizes, outer) != 6).any():
+        raise ValueError("not a benzenoid: an inner face is not a hexagon")
+
+    # an edge is numbered by the smaller of its two darts
+    first = np.flatnonzero(np.arange(len(d.alpha)) < d.alpha)
+    edge_of = np.zeros(len(d.alpha), dtype=np.int64)
+    edge_of[first] = np.arange(len(first))
+    edge_of[d.alpha[first]] = np.arange(len(first))
+
+    inner = np.delete(np.arange(len(sizes)), outer)
+    hexagon_darts = f.darts[f.indptr[inner][:, None] + np.arange(6)]
+    return Hexagons(
+        len(indptr) - 1,
+        np.stack([d.tail[first], d.head[first]], axis=1),
+        edge_of[hexagon_darts],
+        d.tail[hexagon_darts],
+    )
+
+
+class _Template(NamedTuple):
+    clar: pulp.LpProblem
+    fries: pulp.LpProblem
+    x: list[pulp.LpVariable]
+    y: list[pulp.LpVariable]
+
+
+# models of this process by (n, m, h)
+_templates: dict[tuple[int, int, int], _Template] = {}
+
+
+def _template(b: Hexagons) -> _Template:
+    """Returns this process's problems for benzenoids of the size of `b`,
+    with the constraints of the previous benzenoid removed."""
+    key = (b.n, len(b.edges), len(b.hexagon_edges))
+    t = _templates.get(key)
+    if t is None:
+        x = [pulp.LpVariable(f"x_{e}", cat="Binary") for e in range(key[1])]
+        y = [pulp.LpVariable(f"y_{h}", cat="Binary") for h in range(key[2])]
+        objective = pulp.LpAffineExpression([(v, 1) for v in y])
+        clar = pulp.LpProblem("Clar", pulp.LpMaximize)
+        clar.setObjective(objective)
+        fries = pulp.LpProblem("Fries", pulp.LpMaximize)
+        fries.setObjective(objective)
+        t = _templates[key] = _Template(clar, fries, x, y)
+    t.clar.constraints.clear()
+    t.fries.constraints.clear()
+    return t
+
+
+def _incidence(n: int, items: np.ndarray) -> list[list[int]]:
+    """Returns, for every vertex, the rows of `items` (vertex rows) holding it."""
+    rows = np.repeat(np.arange(len(items)), items.shape[1])
+    order = np.argsort(items.ravel(), kind="stable")
+    bounds = np.searchsorted(items.ravel()[order], np.arange(n + 1))
+    rows = rows[order].tolist()
+    return [rows[a:b] for a, b in zip(bounds[:-1].tolist(), bounds[1:].tolist())]
+
+
+def _solve(problem: pulp.LpProblem) -> bool:
+    problem.solve(SOLVER)
+    return problem.status == pulp.LpStatusOptimal
+
+
+def clar(b: Hexagons) -> ClarStructure | None:
+    """A Clar structure of a benzenoid, None when it has no Kekule structure."""
+    t = _template(b)
+    at_edges = _incidence(b.n, b.edges)
+    at_hexagons = _incidence(b.n, b.hexagon_vertices)
+    for v in range(b.n):
+        expr = pulp.LpAffineExpression(
+            [(t.x[e], 1) for e in at_edges[v]] + [(t.y[h], 1) for h in at_hexagons[v]])
+        t.clar.addConstraint(pulp.LpConstraint(expr, pulp.LpConstraintEQ, rhs=1))
+    if not _solve(t.clar):
+        return None
+    sextets = [h for h, v in enumerate(t.y) if v.varValue > 0.5]
+    double_bonds = [e for e, v in enumerate(t.x) if v.varValue > 0.5]
+    return ClarStructure(len(sextets), sextets, double_bonds)
+
+
+def fries(b: Hexagons) -> int | None:
+    """The Fries number of a benzenoid, None when it has no Kekule structure."""
+    t = _template(b)
+    for edges in _incidence(b.n, b.edges):
+        expr = pulp.LpAffineExpression([(t.x[e], 1) for e in edges])
+        t.fries.addConstraint(pulp.LpConstraint(expr, pulp.LpConstraintEQ, rhs=1))
+    for h, edges in enumerate(b.hexagon_edges.tolist()):
+        expr = pulp.LpAffineExpression([(t.x[e], 1) for e in edges] + [(t.y[h], -3)])
+        t.fries.addConstraint(pulp.LpConstraint(expr, pulp.LpConstraintGE, rhs=0))
+    if not _solve(t.fries):
+        return None
+    return round(pulp.value(t.fries.objective))
+
+
+Row = tuple[str, str, str, str]
+
+
+def _solve_task(task: tuple[Hexagons, str]) -> Row:
+    """Worker: returns the output row of one benzenoid."""
+    b, bec = task
+    structure = clar(b)
+    if structure is None:
+        return "-", "-", "-", bec
+    sextets = ",".join(map(str, structure.sextets)) or "-"
+    return str(structure.number), str(fries(b)), sextets, bec
+
+
+def _lattice_points(centers: list[bp.Coordinates]) -> list[tuple[int, int]]:
+    """Hexagon centers as integer combinations (a, b) of the lattice
+    vectors (4, 0) and (2, 3), relative to the first hexagon."""
+    x0, y0 = centers[0]
+    points = []
+    for x, y in centers:
+        b = (y - y0) // 3
+        points.append(((x - x0 - 2 * b) // 4, b))
+    return points
+
+
+def hexagon_map(raw_bec: str, bec: str) -> list[int]:
+    """Returns, for every hexagon of `raw_bec`, the index of the same
+    hexagon of `bec`, a rotated or mirrored code of the same benzenoid.
+
+    Hexagons are in `benparse.bec_lattice` order. The lattices of the two
+    codes differ by one of the 12 symmetries of the hexagonal lattice and
+    a translation: every rotation by 60 degrees, (a, b) -> (-b, a + b),
+    with and without the mirror (a, b) -> (a + b, -b) is tried, aligned
+    by the lowest point.
+    """
+    source = _lattice_points(bp.bec_lattice(raw_bec)[2])
+    target = _lattice_points(bp.bec_lattice(bec)[2])
+    index = {p: i for i, p in enumerate(target)}
+    la, lb = min(target)
+    for points in (source, [(a + b, -b) for a, b in source]):
+        for _ in range(6):
+            points = [(-b, a + b) for a, b in points]
+            pa, pb = min(points)
+            moved = [(a - pa + la, b - pb + lb) for a, b in points]
+            if len(moved) == len(index) and all(p in index for p in moved):
+                return [index[p] for p in moved]
+    raise ValueError(f"BECs {raw_bec} and {bec} are not the same benzenoid")
+
+
+def _relabel(sextets: str, index: list[int]) -> str:
+    """Renumbers a comma-separated list of hexagons by `index`."""
+    if sextets == "-":
+        return sextets
+    return ",".join(map(str, sorted(index[int(h)] for h in sextets.split(","))))
+
+
+def _cached_rows(lines: list[str], solve: Callable[[Iterable], Iterable[Row]]) -> list[Row]:
+    """Rows of BECs, solved by `solve` only for the benzenoids missing in
+    the result cache."""
+    canon = [canonical.canonical_bec(bec) for bec in lines]
+    maps: dict[int, list[int]] = {}
+
+    def index(i: int) -> list[int]:
+        if i not in maps:
+            maps[i] = hexagon_map(lines[i], canon[i])
+        return maps[i]
+
+    def compute(ids: list[int]) -> list[tuple[str, str, str]]:
+        rows = solve((from_bec(lines[i]), lines[i]) for i in ids)
+        return [(c, f, s if lines[i] == canon[i] else _relabel(s, index(i)))
+                for i, (c, f, s, _) in zip(ids, rows)]
+
+    rows = []
+    for i, (c, f, s) in enumerate(resultcache.cached("clar", CACHE_VERSION, canon, compute)):
+        if lines[i] != canon[i]:
+            inverse = [0] * len(index(i))
+            for k, j in enumerate(index(i)):
+                inverse[j] = k
+            s = _relabel(s, inverse)
+        rows.append((c, f, s, lines[i]))
+    return rows
+
+
+def _tasks(file_path: str) -> Iterator[tuple[Hexagons, str]]:
+    if cli.file_ext(file_path) == ".plc":
+        graphs = PlanarCode(file_path)
+        for rotation, b in zip(graphs, all_benzenoid.iter_benzenoids(file_path)):
+            yield from_rotation(*rotation), b.bec
+    else:
+        with open(file_path, "r") as f:
+            for line in f:
+                if line.strip():
+                    yield from_bec(line), line.strip()
+
+
+def solve_file(file_path: str, jobs: int = 1) -> Iterator[Row]:
+    """Yields `(clar, fries, sextets, BEC)` rows of all benzenoids of a file
+    in input order, as they are solved.
+
+    With the result cache on, BEC files are read a chunk of lines at a
+    time and only the benzenoids missing in the cache are solved.
+    """
+    cached = cli.file_ext(file_path) != ".plc" and resultcache.open_cache() is not None
+    with Pool(jobs) if jobs > 1 else nullcontext() as pool:
+        def solve(tasks):
+            if pool is None:
+                return map(_solve_task, tasks)
+            return pool.imap(_solve_task, tasks, chunksize=8)
+
+        if not cached:
+            yield from solve(_tasks(file_path))
+            return
+        with open(file_path, "r") as f:
+            for lines in stream.chunked(line.strip() for line in f if line.strip()):
+                yield from _cached_rows(lines, solve)
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    jobs = cli.pop_option(args, "--jobs", HELP) or 1
+    cache = cli.pop_value(args, "--cache", HELP)
+    if cache is not None:
+        resultcache.enable(cache)
+    if len(args) != 1:
+        raise cli.ArgumentError("Expected a BEC or planar_code file.", HELP)
+
+    for row in solve_file(args[0], jobs):
+        print(" ".join(row), flush=True)
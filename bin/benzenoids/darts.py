@@ -0,0 +1,243 @@
+"""Faces and duals of plane graphs from permutations of darts.
+
+Every edge uv of a graph given by rotation arrays `(indptr, nbrs)` (see
+`planar_code`) is two darts, u->v and v->u. Dart i is the i-th entry of
+`nbrs`: it leaves `tail[i]` and enters `nbrs[i]`, so darts are numbered
+0..2m-1 in rotation order and two integer arrays describe the embedding:
+
+- `sigma[i]`: the next dart around the tail of i (rotation),
+- `alpha[i]`: the reverse dart of i (inverse).
+
+The faces are the cycles of phi = sigma o alpha: a face is left along a
+dart and continued with the dart after its reverse. Cycles are labelled
+by pointer jumping: each dart takes the minimum of its label and the label
+2^k steps ahead, so after about log2(longest face) rounds of NumPy
+operations every dart holds the smallest dart of its face. Positions of
+darts on their faces come from list ranking in the same way, so no step
+walks a face in Python.
+
+`iter_faces` and `iter_duals` run this for many graphs of a planar_code
+file at once, on their disjoint union parsed straight from the mapped
+file.
+"""
+from collections.abc import Iterator
+from typing import NamedTuple
+import numpy as np
+from benzenoids.planar_code import PlanarCode, Rotation
+
+# graphs of a planar_code file processed together
+BATCH_SIZE = 4096
+
+
+class Darts(NamedTuple):
+    tail: np.ndarray
+    head: np.ndarray
+    sigma: np.ndarray
+    alpha: np.ndarray
+
+
+class Faces(NamedTuple):
+    """Faces of an embedding as CSR arrays over darts.
+
+    Darts of face f in cyclic order are `darts[indptr[f]:indptr[f + 1]]`,
+    `face_of[i]` is the face of dart i. Faces are numbered by their
+    smallest dart.
+    """
+    indptr: np.ndarray
+    darts: np.ndarray
+    face_of: np.ndarray
+
+
+def darts(indptr: np.ndarray, nbrs: np.ndarray) -> Darts:
+    """Numbers the darts of rotation arrays and builds sigma and alpha."""
+    indptr = np.asarray(indptr, dtype=np.int64)
+    head = np.asarray(nbrs, dtype=np.int64)
+    n, m2 = len(indptr) - 1, len(head)
+    degree = np.diff(indptr)
+    tail = np.repeat(np.arange(n, dtype=np.int64), degree)
+
+    sigma = np.arange(1, m2 + 1, dtype=np.int64)
+    last = indptr[1:][degree > 0] - 1
+    sigma[last] = indptr[:-1][degree > 0]
+
+    key = tail * n + head
+    order = np.argsort(key, kind="stable")
+    reverse = head * n + tail
+    pos = np.searchsorted(key, reverse, sorter=order)
+    pos[pos == m2] = 0
+    alpha = order[pos]
+    if m2 and not np.array_equal(key[alpha], reverse):
+        raise ValueError("rotation system is not symmetric")
+    return Darts(tail, head, sigma, alpha)
+
+
+def cycle_labels(perm: np.ndarray) -> np.ndarray:
+    """Returns the smallest element of the cycle of every element of `perm`."""
+    label = np.arange(len(perm), dtype=np.int64)
+    jump = np.asarray(perm, dtype=np.int64)
+    while True:
+        ahead = label[jump]
+        if not (ahead < label).any():
+            # labels 2^k apart agree, so every cycle holds its minimum
+            return label
+        np.minimum(label, ahead, out=label)
+        jump = jump[jump]
+
+
+def cycle_positions(perm: np.ndarray, label: np.ndarray) -> np.ndarray:
+    """Returns the number of steps from the smallest element of its cycle
+    to every element of `perm`, with cycles labelled by `cycle_labels`."""
+    m = len(perm)
+    # cut every cycle in front of its smallest element and rank the paths
+    index = np.arange(m, dtype=np.int64)
+    jump = np.asarray(perm, dtype=np.int64).copy()
+    end = jump == label
+    jump[end] = index[end]
+    rank = (~end).astype(np.int64)
+    while True:
+        moving = jump != jump[jump]
+        if not moving.any():
+            break
+        rank[moving] += rank[jump[moving]]
+        jump = jump[jump]
+    # rank counts steps to the end of the path, the start is the farthest
+    return rank[label] - rank
+
+
+def faces_of(d: Darts) -> Faces:
+    """Faces of an embedding, each its darts in cyclic order."""
+    phi = d.sigma[d.alpha]
+    label = cycle_labels(phi)
+    position = cycle_positions(phi, label)
+    reps, face_of = np.unique(label, return_inverse=True)
+    order = np.lexsort((position, face_of))
+    indptr = np.zeros(len(reps) + 1, dtype=np.int64)
+    np.cumsum(np.bincount(face_of, minlength=len(reps)), out=indptr[1:])
+    return Faces(indptr, order, face_of)
+
+
+def faces(indptr: np.ndarray, nbrs: np.ndarray) -> Faces:
+    """Faces of a graph given by rotation arrays."""
+    return faces_of(darts(indptr, nbrs))
+
+
+def dual(indptr: np.ndarray, nbrs: np.ndarray) -> tuple[Rotation, int]:
+    """Dual rotation arrays and the outer (longest, first of them) face.
+
+    The neighbours of face f are the faces across its darts, in the order
+    of the darts along f.
+    """
+    d = darts(indptr, nbrs)
+    f = faces_of(d)
+    outer = int(np.argmax(np.diff(f.indptr))) if len(f.indptr) > 1 else -1
+    return (f.indptr, f.face_of[d.alpha[f.darts]].astype(np.int32)), outer
+
+
+def from_dict(rotation: dict[int, list[int]]) -> tuple[list[int], Rotation]:
+    """Converts a dict rotation system to arrays, returns the vertex of every index too."""
+    vertices = sorted(rotation)
+    index = {v: i for i, v in enumerate(vertices)}
+    indptr = np.zeros(len(vertices) + 1, dtype=np.int64)
+    np.cumsum([len(rotation[v]) for v in vertices], out=indptr[1:])
+    nbrs = np.fromiter((index[u] for v in vertices for u in rotation[v]),
+                       dtype=np.int64, count=int(indptr[-1]))
+    return vertices, (indptr, nbrs)
+
+
+def _union(pc: PlanarCode, a: int, b: int) -> tuple[Rotation, np.ndarray]:
+    """Rotation arrays of the disjoint union of graphs a..b-1 of a file,
+    with the vertex offsets of the graphs.
+
+    Graphs stored with 1-byte numbers are parsed together: without the
+    bytes holding their orders, zeros end vertices and the other bytes are
+    neighbours shifted by the offset of their graph.
+    """
+    offsets = pc.offsets[a:b + 1]
+    raw = np.asarray(pc.data[offsets[0]:offsets[-1]])
+    starts = offsets[:-1] - offsets[0]
+    orders = raw[starts].astype(np.int64)
+    if (orders == 0).any():
+        return _union_rotations([pc[k] for k in range(a, b)])
+
+    vertex_offsets = np.zeros(b - a + 1, dtype=np.int64)
+    np.cumsum(orders, out=vertex_offsets[1:])
+    keep = np.ones(len(raw), dtype=bool)
+    keep[starts] = False
+    words = raw[keep]
+    graph_of = np.repeat(np.arange(b - a), np.diff(offsets) - 1)
+
+    zeros = np.flatnonzero(words == 0)
+    if len(zeros) != vertex_offsets[-1]:
+        raise ValueError("graph order does not match its vertex lists")
+    indptr = np.zeros(len(zeros) + 1, dtype=np.int64)
+    indptr[1:] = zeros - np.arange(len(zeros))
+    entry = words != 0
+    nbrs = words[entry].astype(np.int64) - 1 + vertex_offsets[graph_of[entry]]
+    return (indptr, nbrs), vertex_offsets
+
+
+def _union_rotations(rotations: list[Rotation]) -> tuple[Rotation, np.ndarray]:
+    """Disjoint union of graphs given by rotation arrays."""
+    vertex_offsets = np.cumsum([0] + [len(indptr) - 1 for indptr, _ in rotations], dtype=np.int64)
+    dart_offsets = np.cumsum([0] + [len(nbrs) for _, nbrs in rotations], dtype=np.int64)
+    indptr = np.concatenate(
+        [np.zeros(1, dtype=np.int64)]
+        + [indptr[1:] + dart_offsets[k] for k, (indptr, _) in enumerate(rotations)])
+    nbrs = np.concatenate(
+        [np.zeros(0, dtype=np.int64)]
+        + [nbrs.astype(np.int64) + vertex_offsets[k] for k, (_, nbrs) in enumerate(rotations)])
+    return (indptr, nbrs), vertex_offsets
+
+
+class Batch(NamedTuple):
+    """Darts and faces of a disjoint union with the offsets of its graphs.
+
+    Graph k owns vertices vertex_offsets[k]:vertex_offsets[k + 1], and
+    likewise darts and faces.
+    """
+    darts: Darts
+    faces: Faces
+    vertex_offsets: np.ndarray
+    dart_offsets: np.ndarray
+    face_offsets: np.ndarray
+
+
+def batches(f_name: str, batch_size: int = BATCH_SIZE) -> Iterator[Batch]:
+    """Yields darts and faces of the graphs of a planar_code file,
+    `batch_size` graphs at a time as one disjoint union."""
+    pc = PlanarCode(f_name)
+    for a in range(0, len(pc), batch_size):
+        b = min(a + batch_size, len(pc))
+        (indptr, nbrs), vertex_offsets = _union(pc, a, b)
+        d = darts(indptr, nbrs)
+        f = faces_of(d)
+        dart_offsets = indptr[vertex_offsets]
+        # faces are numbered by their smallest dart, so graph by graph
+        face_offsets = np.searchsorted(f.darts[f.indptr[:-1]], dart_offsets)
+        yield Batch(d, f, vertex_offsets, dart_offsets, face_offsets)
+
+
+def iter_faces(f_name: str, batch_size: int = BATCH_SIZE) -> Iterator[Faces]:
+    """Yields faces of every graph of a planar_code file (see `faces`).
+
+    Graphs are processed `batch_size` at a time as one disjoint union.
+    """
+    for d, f, _, dart_offsets, face_offsets in batches(f_name, batch_size):
+        for k in range(len(dart_offsets) - 1):
+            da, fa, fb = dart_offsets[k], face_offsets[k], face_offsets[k + 1]
+            yield Faces(f.indptr[fa:fb + 1] - f.indptr[fa],
+                        f.darts[f.indptr[fa]:f.indptr[fb]] - da,
+                        f.face_of[da:dart_offsets[k + 1]] - fa)
+
+
+def iter_duals(f_name: str, batch_size: int = BATCH_SIZE) -> Iterator[tuple[Rotation, int]]:
+    """Yields dual rotation arrays and outer faces of every graph of a
+    planar_code file (see `dual`), `batch_size` graphs at a time."""
+    for d, f, _, _, face_offsets in batches(f_name, batch_size):
+        dual_nbrs = f.face_of[d.alpha[f.darts]].astype(np.int32)
+        sizes = np.diff(f.indptr)
+        for k in range(len(face_offsets) - 1):
+            fa, fb = face_offsets[k], face_offsets[k + 1]
+            a, b = f.indptr[fa], f.indptr[fb]
+            outer = int(np.argmax(sizes[fa:fb])) if fb > fa else -1
+            yield (f.indptr[fa:fb + 1] - a, dual_nbrs[a:b] - fa), outer
@@ -0,0 +1,199 @@
+"""Reader for planar_code files written by plantri, fullgen and CaGe.
+
+A planar_code file starts with the `>>planar_code<<` header (optionally
+`>>planar_code le<<` or `>>planar_code be<<`), followed by graphs stored
+one after another. Each graph is its order n and then, for every vertex,
+its neighbours in clockwise order terminated by 0. Vertices are numbered
+from 1. When n does not fit into one byte, the graph starts with a 0 byte
+and all numbers (including n) take 2 bytes.
+
+The file is memory-mapped and parsed with NumPy. Byte offsets of all
+graphs are stored in a sidecar `<file>.idx.npy` so that the k-th graph
+can be fetched in O(1) on later runs.
+
+Graphs are returned as flat rotation arrays `(indptr, nbrs)`: neighbours
+of vertex `u` (0-based) in rotation order are `nbrs[indptr[u]:indptr[u + 1]]`.
+"""
+import os
+from collections.abc import Callable, Iterator
+import numpy as np
+
+HEADER = b">>planar_code<<"
+HEADERS = {
+    b">>planar_code<<": "<",
+    b">>planar_code le<<": "<",
+    b">>planar_code be<<": ">",
+}
+INDEX_SUFFIX = ".idx.npy"
+
+# bytes scanned for terminating zeros at once while building the index
+BLOCK_SIZE = 1 << 24
+
+Rotation = tuple[np.ndarray, np.ndarray]
+
+
+class PlanarCode:
+    """Random access view of a planar_code file.
+
+    :param f_name: path to the planar_code file
+    :param index: load/store the offset index in a sidecar file
+    """
+
+    def __init__(self, f_name: str, index: bool = True) -> None:
+        self.f_name: str = f_name
+        self.data: np.ndarray = _map(f_name)
+        self.byteorder, self.start = _header(self.data)
+        self.offsets: np.ndarray = (
+            self._load_index() if index else build_index(self.data, self.start, self.byteorder)
+        )
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, k: int) -> Rotation:
+        if k < 0:
+            k += len(self)
+        if not 0 <= k < len(self):
+            raise IndexError("graph index out of range")
+        return parse_graph(self.data[self.offsets[k]:self.offsets[k + 1]], self.byteorder)
+
+    def __iter__(self) -> Iterator[Rotation]:
+        for k in range(len(self)):
+            yield self[k]
+
+    def graph(self, k: int) -> dict[int, list[int]]:
+        """Returns the k-th graph as a dict of 1-based neighbour lists."""
+        return to_dict(*self[k])
+
+    def _load_index(self) -> np.ndarray:
+        """Loads offsets from the sidecar file, rebuilding it when stale."""
+        return load_index(
+            self.f_name, lambda: build_index(self.data, self.start, self.byteorder))
+
+
+def load_index(f_name: str, build: Callable[[], np.ndarray]) -> np.ndarray:
+    """Loads the offset index of a file from its sidecar, or builds and stores it.
+
+    The sidecar is stamped with the size and modification time of the file
+    and rebuilt when they change.
+    """
+    path = f_name + INDEX_SUFFIX
+    stat = os.stat(f_name)
+    stamp = np.array([stat.st_size, stat.st_mtime_ns], dtype=np.int64)
+
+    try:
+        saved = np.load(path)
+        if np.array_equal(saved[:2], stamp):
+            return saved[2:]
+    except (OSError, ValueError):
+        pass
+
+    offsets = build()
+    try:
+        np.save(path, np.concatenate([stamp, offsets]))
+    except OSError:
+        pass  # read-only location, the index is rebuilt next time
+    return offsets
+
+
+def _map(f_name: str) -> np.ndarray:
+    """Memory-maps a file as a uint8 array (empty files are not mappable)."""
+    if os.path.getsize(f_name) == 0:
+        return np.zeros(0, dtype=np.uint8)
+    return np.memmap(f_name, dtype=np.uint8, mode="r")
+
+
+def _header(data: np.ndarray) -> tuple[str, int]:
+    """Returns the 2-byte byte order and the length of the header."""
+    for header, byteorder in HEADERS.items():
+        if bytes(data[:len(header)]) == header:
+            return byteorder, len(header)
+    raise ValueError("missing header")
+
+
+def build_index(data: np.ndarray, start: int, byteorder: str = "<") -> np.ndarray:
+    """Returns byte offsets of all graphs, with the end of file appended.
+
+    Only graph boundaries are visited: the end of a 1-byte graph of order n
+    is the n-th zero byte after its start, found by `searchsorted` in the
+    zero positions of the current block.
+    """
+    offsets = []
+    pos = start
+    size = len(data)
+    block_end = -1
+    zeros = np.zeros(0, dtype=np.int64)
+
+    while pos < size:
+        offsets.append(pos)
+        n = int(data[pos])
+        if n == 0:
+            n = _u16(data, pos + 1, byteorder)
+            pos = _end_2byte(data, pos + 3, n, byteorder)
+            continue
+
+        # a simple 1-byte graph takes at most 1 + n + n * (n - 1) bytes
+        if pos + 1 + n * n > block_end:
+            block_end = pos + max(BLOCK_SIZE, 1 + n * n)
+            zeros = np.flatnonzero(data[pos:block_end] == 0) + pos
+        k = np.searchsorted(zeros, pos + 1)
+        while k + n > len(zeros):
+            if block_end >= size:
+                raise ValueError(f"truncated graph at byte {pos}")
+            block_end = pos + 2 * (block_end - pos)
+            zeros = np.flatnonzero(data[pos:block_end] == 0) + pos
+            k = np.searchsorted(zeros, pos + 1)
+        pos = int(zeros[k + n - 1]) + 1
+
+    offsets.append(pos)
+    return np.array(offsets, dtype=np.int64)
+
+
+def _u16(data: np.ndarray, pos: int, byteorder: str) -> int:
+    return int.from_bytes(bytes(data[pos:pos + 2]), "little" if byteorder == "<" else "big")
+
+
+def _end_2byte(data: np.ndarray, pos: int, n: int, byteorder: str) -> int:
+    """Returns the end of a 2-byte graph whose vertex lists start at `pos`."""
+    width = 2 * (n + 1)
+    while True:
+        words = data[pos:pos + width]
+        words = words[:len(words) // 2 * 2].view(byteorder + "u2")
+        zeros = np.flatnonzero(words == 0)
+        if len(zeros) >= n:
+            return pos + 2 * (int(zeros[n - 1]) + 1)
+        if pos + width >= len(data):
+            raise ValueError(f"truncated graph at byte {pos}")
+        width *= 2
+
+
+def parse_graph(raw: np.ndarray, byteorder: str = "<") -> Rotation:
+    """Parses the bytes of one graph into flat rotation arrays."""
+    if raw[0] != 0:
+        words = raw[1:]
+    else:
+        words = raw[1:len(raw) // 2 * 2 + 1].view(byteorder + "u2")[1:]
+
+    zeros = np.flatnonzero(words == 0)
+    indptr = np.zeros(len(zeros) + 1, dtype=np.int64)
+    # entries before the i-th terminator, minus the i terminators before it
+    indptr[1:] = zeros - np.arange(len(zeros))
+    nbrs = words[words != 0].astype(np.int32) - 1
+    return indptr, nbrs
+
+
+def to_dict(indptr: np.ndarray, nbrs: np.ndarray) -> dict[int, list[int]]:
+    """Converts rotation arrays to a dict of 1-based neighbour lists."""
+    adj = (nbrs + 1).tolist()
+    return {u + 1: adj[indptr[u]:indptr[u + 1]] for u in range(len(indptr) - 1)}
+
+
+def read_plc(f_name: str) -> Iterator[dict[int, list[int]]]:
+    """Yields graphs of a planar_code file as dicts of 1-based neighbour lists."""
+    for indptr, nbrs in PlanarCode(f_name):
+        yield to_dict(indptr, nbrs)
+
+
+def read_rotations(f_name: str) -> Iterator[Rotation]:
+    """Yields graphs of a planar_code file as flat rotation arrays."""
+    yield from PlanarCode(f_name)
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""Renders every BEC of a file to an image with `Benzy`.
+
+Systems are built quietly and drawn with the non-interactive Agg backend.
+Every worker process keeps one figure and, between systems, removes only
+the artists of the last one instead of clearing the axes or creating a
+new figure per image. Images are named
+`<line number>_<BEC>.<format>` and their paths are printed as they are
+written.
+
+Usage (from `bin/`):
+    python3 -m benzenoids.render FILE [ --output DIR ] [ --format svg | png ]
+                                      [ --jobs N ] [ --labels ]
+"""
+import matplotlib
+
+matplotlib.use("Agg")
+
+import os
+import sys
+from collections.abc import Iterator
+from multiprocessing import Pool
+import matplotlib.pyplot as plt
+import cli
+from benzenoids.benzy import Benzy
+
+FORMATS = ("svg", "png")
+FIGURE_SIZE = (6, 6)
+HELP = (
+    f"Usage: {sys.argv[0]} FILE [ --output DIR ] [ --format svg | png ]"
+    " [ --jobs N ] [ --labels ]"
+)
+
+# figure and axes reused by all images drawn in this process
+_figure: plt.Figure | None = None
+_ax: plt.Axes | None = None
+
+Task = tuple[int, str, str, str, bool]
+
+
+def _axes() -> plt.Axes:
+    """Returns the axes of this process's figure with the last system removed.
+
+    Only the drawn artists are removed, clearing or re-creating the axes
+    costs more than drawing a system.
+    """
+    global _figure, _ax
+    if _ax is None:
+        _figure = plt.figure(figsize=FIGURE_SIZE)
+        _ax = _figure.add_subplot()
+    for artist in [*_ax.collections, *_ax.texts, *_ax.lines, *_ax.patches]:
+        artist.remove()
+    _ax.ignore_existing_data_limits = True
+    return _ax
+
+
+def render(bec: str, path: str, with_labels: bool = False) -> None:
+    """Draws the system of `bec` into the image file `path`."""
+    ax = _axes()
+    Benzy(bec).draw(ax, with_labels=with_labels)
+    _figure.savefig(path)
+
+
+def _render_task(task: Task) -> tuple[str, str | None]:
+    """Worker: renders one BEC, returns the path and an error message."""
+    number, bec, out_dir, fmt, with_labels = task
+    path = os.path.join(out_dir, f"{number}_{bec}.{fmt}")
+    try:
+        render(bec, path, with_labels)
+    except ValueError as e:
+        return path, str(e)
+    return path, None
+
+
+def render_file(
+    file_path: str,
+    out_dir: str = ".",
+    fmt: str = "svg",
+    jobs: int = 1,
+    with_labels: bool = False,
+) -> Iterator[tuple[str, str | None]]:
+    """Renders all BECs of a file, yields (image path, error) in input order."""
+    if fmt not in FORMATS:
+        raise ValueError(f"unknown image format '{fmt}', use one of {FORMATS}")
+    os.makedirs(out_dir, exist_ok=True)
+
+    with open(file_path, "r") as f:
+        tasks = ((i, line.strip(), out_dir, fmt, with_labels)
+                 for i, line in enumerate(f, 1) if line.strip())
+        if jobs > 1:
+            with Pool(jobs) as pool:
+                yield from pool.imap(_render_task, tasks, chunksize=16)
+        else:
+            yield from map(_render_task, tasks)
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    out_dir = cli.pop_value(args, "--output", HELP) or "."
+    fmt = cli.pop_value(args, "--format", HELP) or "svg"
+    jobs = cli.pop_option(args, "--jobs", HELP) or 1
+    with_labels = cli.pop_flag(args, "--labels")
+    if len(args) != 1:
+        raise cli.ArgumentError("Expected one BEC file.", HELP)
+    if fmt not in FORMATS:
+        raise cli.ArgumentError(f"Unknown format '{fmt}'.", HELP)
+
+    failed = 0
+    for path, error in render_file(args[0], out_dir, fmt, jobs, with_labels):
+        if error is None:
+            print(path, flush=True)
+        else:
+            failed += 1
+            print(f"{path}: {error}", file=sys.stderr)
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,144 @@
+"""Reader for writegraph3d files written by fullgen and plantri.
+
+A writegraph3d file starts with a `>>writegraph3d ... <<` header line,
+followed by graphs stored one after another. Every vertex is one line
+with its number, three coordinates and its neighbours, a graph ends with a
+line holding a single 0:
+
+      1  0 0 0    12  13   2
+      2  0 0 0     1   3  98
+    ...
+    0
+
+The file is memory-mapped. Ends of graphs are found by one regular
+expression pass over the mapped bytes, and their byte offsets are kept in
+a sidecar `<file>.idx.npy` (see `planar_code.load_index`), so the k-th
+graph is fetched directly. One graph is parsed at a time by NumPy's text
+parser into an (n, d) array of 0-based neighbours.
+"""
+import mmap
+import os
+import re
+from collections.abc import Iterator
+import numpy as np
+from benzenoids import planar_code
+
+HEADER = b">>writegraph3d"
+# a line holding only the 0 that ends a graph
+END_OF_GRAPH = re.compile(rb"^[ \t]*0[ \t\r]*$\n?", re.MULTILINE)
+
+
+class WriteGraph3D:
+    """Random access view of a writegraph3d file.
+
+    :param f_name: path to the writegraph3d file
+    :param index: load/store the offset index in a sidecar file
+    """
+
+    def __init__(self, f_name: str, index: bool = True) -> None:
+        self.f_name: str = f_name
+        self.data: bytes | mmap.mmap = _map(f_name)
+        self.offsets: np.ndarray = (
+            planar_code.load_index(f_name, lambda: build_index(self.data))
+            if index else build_index(self.data)
+        )
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, k: int) -> np.ndarray:
+        return self.parse(k)[0]
+
+    def __iter__(self) -> Iterator[np.ndarray]:
+        for k in range(len(self)):
+            yield self[k]
+
+    def parse(self, k: int) -> tuple[np.ndarray, np.ndarray]:
+        """Returns (n, d) 0-based neighbours and (n, 3) coordinates of graph k."""
+        if k < 0:
+            k += len(self)
+        if not 0 <= k < len(self):
+            raise IndexError("graph index out of range")
+        return parse_graph(self.data[self.offsets[k]:self.offsets[k + 1]])
+
+    def graph(self, k: int) -> dict[int, list[int]]:
+        """Returns the k-th graph as a dict of 1-based neighbour lists."""
+        nbrs = (self[k] + 1).tolist()
+        return {u + 1: vs for u, vs in enumerate(nbrs)}
+
+
+def _map(f_name: str) -> bytes | mmap.mmap:
+    """Memory-maps a file read-only (empty files are not mappable)."""
+    if os.path.getsize(f_name) == 0:
+        return b""
+    with open(f_name, "rb") as f:
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def build_index(data: bytes | mmap.mmap) -> np.ndarray:
+    """Returns byte offsets of all graphs, with the end of the last one appended."""
+    offsets = [0]
+    for m in END_OF_GRAPH.finditer(data):
+        offsets.append(m.end())
+    return np.array(offsets, dtype=np.int64)
+
+
+def parse_graph(raw: bytes) -> tuple[np.ndarray, np.ndarray]:
+    """Parses the text of one graph into (n, d) neighbours and (n, 3) coordinates.
+
+    Header lines before the graph are skipped. All vertices must have the
+    same degree d, as in fullerenes (d = 3).
+    """
+    while raw.lstrip().startswith(HEADER):
+        raw = raw.lstrip().split(b"\n", 1)[1]
+    first = raw.lstrip().split(b"\n", 1)[0]
+    width = len(first.split())
+
+    values = np.fromstring(raw, dtype=np.float64, sep=" ")[:-1]  # drop the 0
+    if width < 4 or len(values) % width != 0:
+        raise ValueError("writegraph3d graph with vertices of different degrees")
+    rows = values.reshape(-1, width)
+    if not np.array_equal(rows[:, 0], np.arange(1, len(rows) + 1)):
+        raise ValueError("writegraph3d vertices are not numbered 1..n in order")
+    return rows[:, 4:].astype(np.int32) - 1, rows[:, 1:4]
+
+
+class Fullerenes:
+    """(n, 3) neighbour arrays of the graphs in a writegraph3d or planar_code file.
+
+    The format is told by the header. For planar_code the neighbours are
+    in rotation order.
+
+    :param f_name: path to the file
+    :param index: load/store the offset index in a sidecar file
+    """
+
+    def __init__(self, f_name: str, index: bool = True) -> None:
+        with open(f_name, "rb") as f:
+            start = f.read(len(planar_code.HEADER))
+        self.planar: bool = start.startswith(planar_code.HEADER[:-2])
+        self.source: planar_code.PlanarCode | WriteGraph3D = (
+            planar_code.PlanarCode(f_name, index) if self.planar
+            else WriteGraph3D(f_name, index)
+        )
+
+    def __len__(self) -> int:
+        return len(self.source)
+
+    def __getitem__(self, k: int) -> np.ndarray:
+        if not self.planar:
+            return self.source[k]
+        indptr, nbrs = self.source[k]
+        degrees = np.diff(indptr)
+        if len(degrees) and (degrees != degrees[0]).any():
+            raise ValueError("planar_code graph with vertices of different degrees")
+        return nbrs.reshape(len(indptr) - 1, -1)
+
+    def __iter__(self) -> Iterator[np.ndarray]:
+        for k in range(len(self)):
+            yield self[k]
+
+
+def read_fullerenes(f_name: str) -> Iterator[np.ndarray]:
+    """Yields (n, 3) 0-based neighbour arrays of a writegraph3d or planar_code file."""
+    yield from Fullerenes(f_name)
@@ -0,0 +1,198 @@
+"""Canonical forms of graphs and boundary-edges codes.
+
+`canonical_g6` relabels a graph so that isomorphic graphs get the same g6
+string. It is a small individualization-refinement search in the style of
+nauty:
+
+- the vertex partition is refined until it is equitable (vertices in a
+  cell have the same number of neighbours in every cell),
+- when a cell is left with more than one vertex, each of its vertices is
+  individualized in turn and the search recurses,
+- every discrete partition (leaf) gives a labelling, the canonical form
+  is the smallest g6 string among the leaves.
+
+Automorphisms found on the way (two leaves with equal strings) prune the
+search: children in the same orbit are skipped and a leaf equal to the
+first one jumps straight back to where its path left the first path.
+
+`canonical_bec` is the smallest cyclic shift of a BEC or of its reverse,
+so mirror images and different starting points give the same code.
+"""
+from collections import deque
+from benzenoids import benparse as bp
+from benzenoids import benzenoid_symmetry as bs
+
+Cells = list[list[int]]
+
+
+def canonical_bec(raw_bec: str) -> str:
+    """Returns the canonical BEC under rotation and reflection."""
+    bec = raw_bec.strip()
+    return min(bs.minimum_representation(bec),
+               bs.minimum_representation(bec[::-1]))
+
+
+def canonical_g6(raw_g6: str | bytes) -> str:
+    """Returns the canonical g6 string of a g6 graph."""
+    n, edges = bp.from_g6_edges(raw_g6)
+    nbrs: list[list[int]] = [[] for _ in range(n)]
+    for u, v in edges.tolist():
+        nbrs[u].append(v)
+        nbrs[v].append(u)
+    label = canonical_labeling(nbrs)
+    return bp.to_g6(n, [(label[u], label[v]) for u, v in edges.tolist()])
+
+
+def canonical_labeling(nbrs: list[list[int]]) -> list[int]:
+    """Returns the canonical label of every vertex of a graph."""
+    search = _Search(nbrs)
+    search.run()
+    return search.best_label
+
+
+def _refine(nbrs: list[list[int]], cells: Cells, active: list[int] | None = None) -> Cells:
+    """Refines an ordered partition until it is equitable.
+
+    Cells are kept as consecutive runs of one vertex list. A queue holds
+    splitter cells W: the cells with neighbours in W are split by the
+    number of those neighbours, pieces ordered by that number, and the
+    pieces join the queue. Only positions are used, never vertex labels,
+    so the result does not depend on how the graph is labelled.
+
+    :param active: indexes of the cells to start the queue with, all when
+        None; a partition that was equitable before one cell was split
+        only needs the new pieces
+    """
+    lab = [v for c in cells for v in c]
+    cell = [0] * len(nbrs)
+    size: dict[int, int] = {}
+    start = 0
+    for c in cells:
+        size[start] = len(c)
+        for v in c:
+            cell[v] = start
+        start += len(c)
+
+    starts = list(size)
+    queue = deque(starts if active is None else [starts[i] for i in active])
+    queued = set(queue)
+    while queue:
+        w = queue.popleft()
+        queued.discard(w)
+        count: dict[int, int] = {}
+        for x in lab[w:w + size[w]]:
+            for y in nbrs[x]:
+                count[y] = count.get(y, 0) + 1
+
+        for s in sorted({cell[y] for y in count}):
+            if size[s] == 1:
+                continue
+            groups: dict[int, list[int]] = {}
+            for v in lab[s:s + size[s]]:
+                groups.setdefault(count.get(v, 0), []).append(v)
+            if len(groups) == 1:
+                continue
+            pos = s
+            for key in sorted(groups):
+                piece = groups[key]
+                lab[pos:pos + len(piece)] = piece
+                size[pos] = len(piece)
+                for v in piece:
+                    cell[v] = pos
+                if pos not in queued:
+                    queue.append(pos)
+                    queued.add(pos)
+                pos += len(piece)
+
+    return [lab[s:s + size[s]] for s in sorted(size)]
+
+
+class _Search:
+    """State of one canonical labelling search."""
+
+    def __init__(self, nbrs: list[list[int]]) -> None:
+        self.nbrs = nbrs
+        self.n = len(nbrs)
+        self.first_cert: str | None = None
+        self.first_label: list[int] = []
+        self.first_path: list[int] = []
+        self.best_cert: str | None = None
+        self.best_label: list[int] = list(range(self.n))
+        self.automorphisms: list[list[int]] = []
+
+    def run(self) -> None:
+        if self.n > 0:
+            self.search([list(range(self.n))], [], None)
+
+    def certificate(self, label: list[int]) -> str:
+        edges = [(label[u], label[v])
+                 for u in range(self.n) for v in self.nbrs[u] if u < v]
+        return bp.to_g6(self.n, edges)
+
+    def automorphism(self, label: list[int], other: list[int]) -> None:
+        """Stores the automorphism mapping labelling `label` onto `other`."""
+        vertex_of = [0] * self.n
+        for v, i in enumerate(other):
+            vertex_of[i] = v
+        self.automorphisms.append([vertex_of[label[v]] for v in range(self.n)])
+
+    def leaf(self, cells: Cells, path: list[int]) -> int | None:
+        """Handles a discrete partition, returns the level to jump back to."""
+        label = [0] * self.n
+        for i, (v,) in enumerate(cells):
+            label[v] = i
+        cert = self.certificate(label)
+
+        if self.first_cert is None:
+            self.first_cert, self.first_label, self.first_path = cert, label, path
+            self.best_cert, self.best_label = cert, label
+            return None
+        if cert == self.first_cert:
+            self.automorphism(label, self.first_label)
+            # the subtree where this path left the first one is its image
+            for level, (a, b) in enumerate(zip(path, self.first_path)):
+                if a != b:
+                    return level
+            return None
+        if cert == self.best_cert:
+            self.automorphism(label, self.best_label)
+        elif cert < self.best_cert:
+            self.best_cert, self.best_label = cert, label
+        return None
+
+    def same_orbit(self, v: int, explored: list[int], path: list[int]) -> bool:
+        """Whether an automorphism fixing `path` maps `v` onto an explored vertex."""
+        parent = list(range(self.n))
+
+        def find(x: int) -> int:
+            while parent[x] != x:
+                parent[x] = parent[parent[x]]
+                x = parent[x]
+            return x
+
+        for g in self.automorphisms:
+            if all(g[x] == x for x in path):
+                for x in range(self.n):
+                    a, b = find(x), find(g[x])
+                    if a != b:
+                        parent[a] = b
+        root = find(v)
+        return any(find(u) == root for u in explored)
+
+    def search(self, cells: Cells, path: list[int], active: list[int] | None) -> int | None:
+        cells = _refine(self.nbrs, cells, active)
+        target = next((i for i, c in enumerate(cells) if len(c) > 1), None)
+        if target is None:
+            return self.leaf(cells, path)
+
+        explored: list[int] = []
+        for v in sorted(cells[target]):
+            if explored and self.same_orbit(v, explored, path):
+                continue
+            explored.append(v)
+            rest = [u for u in cells[target] if u != v]
+            child = cells[:target] + [[v], rest] + cells[target + 1:]
+            jump = self.search(child, path + [v], [target])
+            if jump is not None and jump < len(path):
+                return jump
+        return None
@@ -10,8 +10,50 @@ class ArgumentError(Exception):
 
 class Config(NamedTuple):
     file_path: str
+    general: bool = False
+    stream: bool = False
+    top: int | None = None
+    bottom: int | None = None
+    jobs: int = 1
 
 
 def file_ext(file_path: str) -> str:
     """Returns file extension."""
     return pathlib.Path(file_path).suffix
+
+
+def pop_flag(args: list[str], name: str) -> bool:
+    """Removes a boolean flag from `args`, returns whether it was present."""
+    found = name in args
+    while name in args:
+        args.remove(name)
+    return found
+
+
+def pop_value(args: list[str], name: str, usage: str) -> str | None:
+    """Removes an option with a value (e.g. `--output out.json`) from `args`."""
+    if name not in args:
+        return None
+    i = args.index(name)
+    if i + 1 >= len(args):
+        raise ArgumentError(f"Option '{name}' needs a value.", usage)
+    value = args[i + 1]
+    del args[i:i + 2]
+    return value
+
+
+def pop_option(args: list[str], name: str, usage: str, minimum: int = 1) -> int | None:
+    """Removes an integer option (e.g. `--top 10`) from `args` and returns it.
+
+    :param minimum: smallest accepted value, counts like `--jobs` need 1
+    """
+    value = pop_value(args, name, usage)
+    if value is None:
+        return None
+    try:
+        number = int(value)
+    except ValueError:
+        raise ArgumentError(f"Option '{name}' needs an integer value.", usage)
+    if number < minimum:
+        raise ArgumentError(f"Option '{name}' needs a value of at least {minimum}.", usage)
+    return number
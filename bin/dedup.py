@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""Drops duplicate structures from .bec and .g6 files.
+
+Every line is brought to its canonical form (BEC up to rotation and
+reflection, graph6 up to relabelling, see `canonical.py`), hashed to a
+128-bit key and looked up in a `hashstore.HashSet`. Lines whose key was
+not seen before are printed in input order, so merging outputs of
+several generator runs is
+
+    python3 dedup.py run1.bec run2.bec > merged.bec
+
+With `--store FILE` the set lives in a memory-mapped file, which keeps
+memory flat for tens of millions of structures and lets later runs skip
+everything deduplicated before. `--jobs N` canonicalizes in N processes.
+"""
+import sys
+from collections.abc import Iterator
+from multiprocessing import Pool
+import numpy as np
+import canonical
+import cli
+import hashstore
+from indexes import stream
+
+HELP = f"Usage: {sys.argv[0]} [ --store FILE ] [ --jobs N ] FILE ..."
+
+
+def canonical_lines(lines: list[str], extension: str) -> list[str]:
+    """Returns canonical forms of the structures on `lines`."""
+    if extension == ".bec":
+        return [canonical.canonical_bec(s) for s in lines]
+    if extension == ".g6":
+        return [canonical.canonical_g6(s.strip()) for s in lines]
+    raise ValueError("wrong file extension. Consider renaming to '.bec' or '.g6'")
+
+
+def _keyed(task: tuple[list[str], str]) -> tuple[list[str], np.ndarray]:
+    """Worker: returns the lines of a chunk with the keys of their structures."""
+    lines, extension = task
+    return lines, hashstore.digest(canonical_lines(lines, extension))
+
+
+def dedup(
+    files: list[str], store: hashstore.HashSet, jobs: int = 1
+) -> Iterator[str]:
+    """Yields lines of `files` whose structure is not in `store` yet."""
+    pool = Pool(jobs) if jobs > 1 else None
+    try:
+        for file_path in files:
+            extension = cli.file_ext(file_path)
+            with open(file_path, "r") as f:
+                tasks = (([s for s in lines if s.strip()], extension)
+                         for lines in stream.chunked(f))
+                keyed = pool.imap(_keyed, tasks) if pool else map(_keyed, tasks)
+                for lines, keys in keyed:
+                    for line, new in zip(lines, store.add_many(keys)):
+                        if new:
+                            yield line
+    finally:
+        if pool:
+            pool.close()
+            pool.join()
+        store.flush()
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    store_path = cli.pop_value(args, "--store", HELP)
+    jobs = cli.pop_option(args, "--jobs", HELP) or 1
+    if not args:
+        raise cli.ArgumentError("No input files.", HELP)
+
+    seen = hashstore.HashSet(store_path)
+    for i, line in enumerate(dedup(args, seen, jobs), 1):
+        sys.stdout.write(line if line.endswith("\n") else line + "\n")
+        if i % stream.CHUNK_SIZE == 0:
+            sys.stdout.flush()
@@ -1,8 +1,19 @@
 #!/bin/python3
 
 import sys
+from collections.abc import Iterator
 import numpy as np
 import networkx as nx
+import cli
+from benzenoids import benparse as bp
+from benzenoids.planar_code import PlanarCode
+from indexes import stream
+
+NAMES = ("E", "gap", "rho", "M2", "M3", "M4")
+BATCH_SIZE = 4096
+HELP = (
+    f"Usage: {sys.argv[0]} [ *.g6 | *.plc ] [ --stream | --top K | --bottom K ]"
+)
 
 cube = nx.Graph([
     (1, 2), (2, 3), (3, 4), (4, 1)
@@ -121,6 +132,87 @@ def total_pi_charge(g: nx.Graph) -> list[float]:
         print()
 
 
+def invariants_batch(adj: np.ndarray) -> dict[str, np.ndarray]:
+    """Spectral invariants of a (B, n, n) stack of adjacency matrices.
+
+    E is the graph energy (sum of |eigenvalue|), gap the HOMO-LUMO gap
+    (HOMO is the ceil(n / 2)-th and LUMO the (floor(n / 2) + 1)-th largest
+    eigenvalue), rho the spectral radius and Mk = sum of eigenvalue^k the
+    spectral moments, taken exactly as traces of A^k.
+    """
+    b, n, _ = adj.shape
+    values = np.linalg.eigvalsh(adj.astype(np.float64))
+    a = adj.astype(np.int64)
+    a2 = a @ a
+    return {
+        "E": np.abs(values).sum(axis=1),
+        "gap": values[:, n - (n + 1) // 2] - values[:, n - n // 2 - 1],
+        "rho": np.abs(values).max(axis=1),
+        "M2": a.sum(axis=(1, 2)),
+        "M3": np.einsum("bij,bji->b", a2, a),
+        "M4": (a2 * a2).sum(axis=(1, 2)),
+    }
+
+
+def _rows(batches, count: int, names: list[str]) -> list[tuple]:
+    """Turns (ids, adjacency stack) batches into rows in input order."""
+    columns = {name: [None] * count for name in NAMES}
+    for ids, adj in batches:
+        values = invariants_batch(adj)
+        for name in NAMES:
+            for i, v in zip(ids, values[name].tolist()):
+                columns[name][i] = v
+    return list(zip(*(columns[name] for name in NAMES), names))
+
+
+def invariants_g6(lines: list[str]) -> list[tuple]:
+    """Calculates (E, gap, rho, M2, M3, M4, g6) rows for g6 lines."""
+    lines = [s for s in lines if s.strip()]
+    batches = (
+        (ids[s:s + BATCH_SIZE], bp.from_g6_batch([lines[i] for i in ids[s:s + BATCH_SIZE]]))
+        for ids in bp.group_by_order(lines).values()
+        for s in range(0, len(ids), BATCH_SIZE)
+    )
+    return _rows(batches, len(lines), lines)
+
+
+def invariants_plc(graphs: list[tuple[np.ndarray, np.ndarray]]) -> list[tuple]:
+    """Calculates (E, gap, rho, M2, M3, M4, g6) rows for planar_code rotations."""
+    groups: dict[int, list[int]] = {}
+    for i, (indptr, _) in enumerate(graphs):
+        groups.setdefault(len(indptr) - 1, []).append(i)
+
+    names = []
+    for indptr, nbrs in graphs:
+        src = np.repeat(np.arange(len(indptr) - 1), np.diff(indptr))
+        names.append(bp.to_g6(len(indptr) - 1, zip(src.tolist(), nbrs.tolist())))
+
+    def batches():
+        for n, ids in groups.items():
+            adj = np.zeros((len(ids), n, n), dtype=np.uint8)
+            for j, i in enumerate(ids):
+                indptr, nbrs = graphs[i]
+                adj[j, np.repeat(np.arange(n), np.diff(indptr)), nbrs] = 1
+            yield ids, adj
+
+    return _rows(batches(), len(graphs), names)
+
+
+def iter_invariants(file_path: str) -> Iterator[tuple]:
+    """Yields (E, gap, rho, M2, M3, M4, g6) for each graph in a .g6/.plc file."""
+    extension = cli.file_ext(file_path)
+    if extension == ".g6":
+        with open(file_path, "r") as f:
+            for lines in stream.chunked(f):
+                yield from invariants_g6(lines)
+    elif extension == ".plc":
+        for graphs in stream.chunked(PlanarCode(file_path)):
+            yield from invariants_plc(graphs)
+    else:
+        raise ValueError(
+            "wrong file extension. Consider renaming to '.g6' or '.plc'")
+
+
 def eig(g: nx.Graph) -> None:
     eigval, eigvec = eigs(g)
 
@@ -132,6 +224,19 @@ def eig(g: nx.Graph) -> None:
 
 
 if __name__ == "__main__":
+    if len(sys.argv) > 1 and cli.file_ext(sys.argv[1]) in (".g6", ".plc"):
+        args = sys.argv[1:]
+        streamed = cli.pop_flag(args, "--stream")
+        top = cli.pop_option(args, "--top", HELP, minimum=0)
+        bottom = cli.pop_option(args, "--bottom", HELP, minimum=0)
+        if top is not None and bottom is not None:
+            raise cli.ArgumentError("Use only one of --top and --bottom.", HELP)
+
+        print(" ".join(NAMES), "g6s", flush=True)
+        rows = stream.select(iter_invariants(args[0]), top, bottom, streamed)
+        stream.write_rows(rows)
+        sys.exit(0)
+
     try:
         match sys.argv[1]:
             case "cube":
@@ -161,6 +266,7 @@ if __name__ == "__main__":
     except IndexError:
         print("""
 usage: python3 eigen_values.py <str> 
+       python3 eigen_values.py [ *.g6 | *.plc ] [ --stream | --top K | --bottom K ]
 
 print eigen values and eigen vectors for structure (select one): 
 
@@ -170,4 +276,7 @@ print eigen values and eigen vectors for structure (select one):
 - benzene
 - cubane
 - c7
+
+or print graph energy E, HOMO-LUMO gap, spectral radius rho and spectral
+moments M2, M3, M4 of every graph in a file (sorted by E unless --stream)
         """)
\ No newline at end of file
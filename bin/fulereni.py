@@ -1,7 +1,37 @@
 #!/usr/bin/env python3
+"""Shows fullerenes drawn by their adjacency eigenvectors.
+
+Coordinates of the vertices are the eigenvectors of the 2nd, 3rd and 4th
+largest eigenvalues of the adjacency matrix. Only these are computed
+(`spectral.top_k`), so large fullerenes do not need the full spectrum.
+
+Usage:
+    python3 fulereni.py FILE [ K ]
+    python3 fulereni.py FILE --export OUT.npz [ --jobs N ] [ --render DIR ]
+
+shows the K-th fullerene (the first by default) of FILE, written by
+fullgen in writegraph3d or planar_code format, e.g.
+    ./fullgen 100 code 6 symm D2d > fulereni_n100_D2d.txt
+
+With --export no window is opened: layouts of all fullerenes of FILE are
+computed in a process pool and saved to one NPZ file (see
+`export_layouts`), --render also draws each of them offscreen into
+DIR/<K>.png.
+"""
+import os
 import sys
+from collections.abc import Iterator
+from multiprocessing import Pool
 import numpy as np
-from vedo import *
+import cli
+import spectral
+from benzenoids.writegraph3d import Fullerenes
+
+AXES = (2, 3, 4)
+HELP = (
+    f"Usage: {sys.argv[0]} FILE [ K ]\n"
+    f"       {sys.argv[0]} FILE --export OUT.npz [ --jobs N ] [ --render DIR ]"
+)
 
 cube = {
     1: [2, 4, 5],
@@ -25,37 +55,27 @@ coordinates = {
     8: (0, 1, 1),
 }
 
-coordinates_list = [coordinates[i] for i in range(1, 8 + 1)]
-edge_list = [(u, v) for v in cube for u in cube[v] if u < v]
 
-points = Points(coordinates_list, r=10, c='green')
-lines = Lines([[coordinates[u], coordinates[v]] for u, v in edge_list])
+def show_cube():
+    """Shows the cube with the coordinates given above."""
+    from vedo import Lines, Plotter, Points
+
+    coordinates_list = [coordinates[i] for i in range(1, 8 + 1)]
+    edge_list = [(u, v) for v in cube for u in cube[v] if u < v]
+
+    points = Points(coordinates_list, r=10, c='green')
+    lines = Lines([[coordinates[u], coordinates[v]] for u, v in edge_list])
+    Plotter().show(points, lines)
 
-# plt = Plotter()
-# plt.show(points, lines)
-# pip3 install vedo
-# ./fullgen 100 code 6 symm D2d > fulereni_n100_D2d.txt
 
 def load_fullerenes(file_name):
-    f = open(file_name, 'r')
-    lst = []
-    g = {}
-    while True:
-        line = f.readline().strip()
-        if line == '':
-            break
-        if line.startswith('>>writegraph3d'):
-            continue
-        tok = [int(x) for x in line.split()]
-        if len(tok) == 1:
-            lst.append(g)
-            g = {}
-        else:
-            v = tok[0]
-            neigh = tok[4:]
-            g[v] = neigh
-    f.close()
-    return lst
+    """Returns all fullerenes of a file as dicts of 1-based neighbour lists.
+
+    Use `Fullerenes` to read them lazily as (n, 3) neighbour arrays.
+    """
+    return [{u + 1: vs for u, vs in enumerate((nbrs + 1).tolist())}
+            for nbrs in Fullerenes(file_name)]
+
 
 def adjacency_matrix(g):
     n = len(g)
@@ -65,32 +85,129 @@ def adjacency_matrix(g):
             A[u - 1][v - 1] = 1.0
     return A
 
+
 def get_coordinates(g, kx, ky, kz):
-    A = adjacency_matrix(g)
-    n = len(g)
-    eigval, eigvec = np.linalg.eigh(A)
-    sx = (eigval[n - 1] - eigval[n - kx])**-0.5
-    sy = (eigval[n - 1] - eigval[n - ky])**-0.5
-    sz = (eigval[n - 1] - eigval[n - kz])**-0.5
-    coords = {i: (eigvec[i - 1, n - kx],
-                  eigvec[i - 1, n - ky],
-                  eigvec[i - 1, n - kz]) for i in range(1, n + 1)}
+    """Coordinates from the eigenvectors of the kx-th, ky-th and kz-th
+    largest eigenvalues (1 is the largest)."""
+    eigval, eigvec = spectral.top_k(spectral.from_dict(g), max(kx, ky, kz))
+    coords = {i: (eigvec[i - 1, kx - 1],
+                  eigvec[i - 1, ky - 1],
+                  eigvec[i - 1, kz - 1]) for i in range(1, len(g) + 1)}
     return coords
 
-# --------------------------------------------------------------------------
 
-f_list = load_fullerenes(sys.argv[1])
-total = len(f_list)
+def layout(nbrs, kx, ky, kz):
+    """Like `get_coordinates`, for an (n, d) array of 0-based neighbours.
+
+    Returns an (n, 3) array, row u holds the coordinates of vertex u.
+    """
+    _, eigvec = spectral.top_k(spectral.from_neighbours(nbrs), max(kx, ky, kz))
+    return eigvec[:, [kx - 1, ky - 1, kz - 1]]
+
+
+def edges(nbrs):
+    """Returns the (m, 2) array of edges u < v of (n, d) neighbours."""
+    n, d = nbrs.shape
+    u = np.repeat(np.arange(n, dtype=nbrs.dtype), d)
+    v = nbrs.ravel()
+    return np.stack([u[u < v], v[u < v]], axis=1)
+
+
+def _layout_task(nbrs):
+    """Worker: returns the layout and the edges of one fullerene."""
+    return layout(nbrs, *AXES), edges(nbrs)
+
+
+def export_layouts(file_name, out, jobs=1):
+    """Computes layouts of all fullerenes of a file and saves them to `out`.
+
+    The NPZ file holds the graphs one after another:
+    - `coords`: (total n, 3) float64 coordinates,
+    - `edges`: (total m, 2) int32 edges, 0-based within their graph,
+    - `vertex_offsets`, `edge_offsets`: (count + 1) int64, graph k owns
+      rows offsets[k]:offsets[k + 1],
+    - `axes`: which eigenvectors were used (see `AXES`).
+
+    Returns the number of fullerenes.
+    """
+    fullerenes = Fullerenes(file_name)
+    if jobs > 1:
+        with Pool(jobs) as pool:
+            results = pool.map(_layout_task, fullerenes, chunksize=16)
+    else:
+        results = list(map(_layout_task, fullerenes))
+
+    coords = [c for c, _ in results]
+    edge_arrays = [e for _, e in results]
+    np.savez(
+        out,
+        coords=np.concatenate(coords) if coords else np.empty((0, 3)),
+        edges=(np.concatenate(edge_arrays).astype(np.int32) if edge_arrays
+               else np.empty((0, 2), dtype=np.int32)),
+        vertex_offsets=np.cumsum([0] + [len(c) for c in coords], dtype=np.int64),
+        edge_offsets=np.cumsum([0] + [len(e) for e in edge_arrays], dtype=np.int64),
+        axes=np.array(AXES),
+    )
+    return len(results)
+
+
+def load_layouts(path):
+    """Yields (coords, edges) of every fullerene of an `export_layouts` file."""
+    with np.load(path) as data:
+        coords, edge_array = data["coords"], data["edges"]
+        vo, eo = data["vertex_offsets"], data["edge_offsets"]
+    for k in range(len(vo) - 1):
+        yield coords[vo[k]:vo[k + 1]], edge_array[eo[k]:eo[k + 1]]
+
+
+def _plot(coords, edge_array, title, offscreen=False):
+    from vedo import Lines, Plotter, Points
+
+    points = Points(coords, r=6, c='black')
+    lines = Lines(coords[edge_array[:, 0]], coords[edge_array[:, 1]])
+    plt = Plotter(offscreen=offscreen)
+    plt.show(points, lines, title)
+    return plt
+
+
+def render_layouts(path, out_dir) -> Iterator[str]:
+    """Draws every layout of an `export_layouts` file offscreen to PNG files.
+
+    Yields the paths of the images as they are written.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    for k, (coords, edge_array) in enumerate(load_layouts(path), 1):
+        image = os.path.join(out_dir, f"{k}.png")
+        plt = _plot(coords, edge_array, f'Fulerene {k}', offscreen=True)
+        plt.screenshot(image)
+        plt.close()
+        yield image
+
+
+def show_fullerenes(fullerenes, index=0):
+    """Shows the fullerene at `index` of a `Fullerenes` file."""
+    nbrs = fullerenes[index]
+    _plot(layout(nbrs, *AXES), edges(nbrs),
+          f'Fulerene {index + 1} of {len(fullerenes)}')
 
-for index, ful in enumerate(f_list):
-    n = len(ful)
-    coords = get_coordinates(ful, 2, 3, 4)
-    coordinates_list = [coords[i] for i in range(1, n + 1)]
-    edge_list = [(u, v) for v in ful for u in ful[v] if u < v]
 
-    points = Points(coordinates_list, r=6, c='black')
-    lines = Lines([[coords[u], coords[v]] for u, v in edge_list])
+if __name__ == "__main__":
+    # pip3 install vedo
+    args = sys.argv[1:]
+    out = cli.pop_value(args, "--export", HELP)
+    jobs = cli.pop_option(args, "--jobs", HELP) or 1
+    render_dir = cli.pop_value(args, "--render", HELP)
+    if not 1 <= len(args) <= 2 or (out is not None and len(args) != 1):
+        raise cli.ArgumentError("Expected a fullerene file.", HELP)
+    if render_dir is not None and out is None:
+        raise cli.ArgumentError("--render needs --export.", HELP)
 
-    plt = Plotter()
-    plt.show(points, lines, f'Fulerene {index + 1} of {total}')
-    break
+    if out is None:
+        k = int(args[1]) - 1 if len(args) > 1 else 0
+        show_fullerenes(Fullerenes(args[0]), k)
+    else:
+        count = export_layouts(args[0], out, jobs)
+        print(f"{count} layouts written to {out}")
+        if render_dir is not None:
+            for image in render_layouts(out, render_dir):
+                print(image, flush=True)
@@ -0,0 +1,149 @@
+"""On-disk set of 128-bit keys for deduplicating large collections.
+
+The set is an open-addressing hash table stored in a memory-mapped file:
+a header of two uint64 words (number of keys, capacity) followed by
+`capacity` slots of two uint64 words. A slot of two zeros is empty, so
+the lowest bit of every key is forced to 1. Keys are blake2b digests of
+canonical strings, already uniformly distributed, their second word is
+used as the hash.
+
+Keys are inserted in batches with NumPy: every round probes all pending
+keys at once, keys that found themselves are dropped, keys that found an
+empty slot claim it (one wins, the others retry) and the rest move to
+the next slot. The table doubles when it becomes half full.
+"""
+import hashlib
+import os
+from collections.abc import Iterable
+import numpy as np
+
+HEADER_WORDS = 2
+INITIAL_CAPACITY = 1 << 16
+MAX_LOAD = 0.5
+
+
+def digest(strings: Iterable[str]) -> np.ndarray:
+    """Returns (N, 2) uint64 keys of strings."""
+    raw = b"".join(hashlib.blake2b(s.encode(), digest_size=16).digest() for s in strings)
+    return np.frombuffer(raw, dtype="<u8").reshape(-1, 2)
+
+
+class HashSet:
+    """Set of 128-bit keys, kept in the file `path` or in memory when None.
+
+    :param path: file holding the table, created when missing
+    :param capacity: initial number of slots of a new table (power of 2)
+    """
+
+    def __init__(self, path: str | None = None, capacity: int = INITIAL_CAPACITY) -> None:
+        self.path = path
+        if path is not None and os.path.exists(path):
+            self.data = np.memmap(path, dtype="<u8", mode="r+")
+        else:
+            self.data = _new_table(path, capacity)
+
+    def __len__(self) -> int:
+        return int(self.data[0])
+
+    @property
+    def capacity(self) -> int:
+        return int(self.data[1])
+
+    @property
+    def slots(self) -> np.ndarray:
+        return self.data[HEADER_WORDS:].reshape(-1, 2)
+
+    def add_many(self, keys: np.ndarray) -> np.ndarray:
+        """Inserts (N, 2) uint64 keys, returns which of them were new.
+
+        Of equal keys within the batch only the first one counts as new.
+        """
+        keys = np.array(keys, dtype=np.uint64).reshape(-1, 2)
+        keys[:, 0] |= np.uint64(1)
+        new = np.zeros(len(keys), dtype=bool)
+        if len(keys) == 0:
+            return new
+
+        first = _first_occurrences(keys)
+        while len(self) + len(first) > MAX_LOAD * self.capacity:
+            self._grow()
+        new[first[self._insert(keys[first])]] = True
+        return new
+
+    def add(self, key: np.ndarray) -> bool:
+        """Inserts one key, returns whether it was new."""
+        return bool(self.add_many(np.asarray(key).reshape(1, 2))[0])
+
+    def flush(self) -> None:
+        if isinstance(self.data, np.memmap):
+            self.data.flush()
+
+    def _insert(self, keys: np.ndarray) -> np.ndarray:
+        """Inserts distinct keys with their low bit set, returns a mask of new ones."""
+        slots = self.slots
+        mask = np.uint64(self.capacity - 1)
+        new = np.zeros(len(keys), dtype=bool)
+        pending = np.arange(len(keys))
+        slot = keys[:, 1] & mask
+
+        while len(pending):
+            k = keys[pending]
+            s = slot[pending]
+            found = slots[s]
+            empty = found[:, 0] == 0
+            same = (found == k).all(axis=1)
+
+            # all keys write into their empty slots, the key read back won
+            # the slot, the others look at it again in the next round
+            claim = np.flatnonzero(empty)
+            slots[s[claim]] = k[claim]
+            take = claim[(slots[s[claim]] == k[claim]).all(axis=1)]
+            new[pending[take]] = True
+
+            move = ~empty & ~same
+            slot[pending[move]] = (s[move] + np.uint64(1)) & mask
+            done = same
+            done[take] = True
+            pending = pending[~done]
+
+        self.data[0] += np.uint64(new.sum())
+        return new
+
+    def _grow(self) -> None:
+        """Doubles the capacity, rehashing into a new file that replaces the old."""
+        old = np.array(self.slots[self.slots[:, 0] != 0])
+        tmp = None if self.path is None else self.path + ".tmp"
+        self.data = _new_table(tmp, 2 * self.capacity)
+        self._insert(old)
+        if self.path is not None:
+            self.data.flush()
+            del self.data
+            os.replace(tmp, self.path)
+            self.data = np.memmap(self.path, dtype="<u8", mode="r+")
+
+
+def _first_occurrences(keys: np.ndarray) -> np.ndarray:
+    """Returns positions of the first occurrence of every distinct key."""
+    order = np.argsort(keys[:, 1])
+    ordered = keys[order]
+    start = np.ones(len(keys), dtype=bool)
+    start[1:] = ordered[1:, 1] != ordered[:-1, 1]
+    if (ordered[1:, 0] != ordered[:-1, 0])[~start[1:]].any():
+        # distinct keys sharing the hash word, sort by both words
+        order = np.lexsort((keys[:, 0], keys[:, 1]))
+        ordered = keys[order]
+        start[1:] = (ordered[1:] != ordered[:-1]).any(axis=1)
+    return np.sort(np.minimum.reduceat(order, np.flatnonzero(start)))
+
+
+def _new_table(path: str | None, capacity: int) -> np.ndarray:
+    """Creates an empty table with `capacity` slots."""
+    if capacity & (capacity - 1):
+        raise ValueError("capacity must be a power of 2")
+    shape = (HEADER_WORDS + 2 * capacity,)
+    if path is None:
+        data = np.zeros(shape, dtype="<u8")
+    else:
+        data = np.memmap(path, dtype="<u8", mode="w+", shape=shape)
+    data[1] = capacity
+    return data
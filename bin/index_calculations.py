@@ -2,29 +2,56 @@
 import sys
 import cli
 from cli import ArgumentError
-from indexes import wiener, zagreb
+from indexes import degree, wiener, zagreb
 
-HELP = f"Usage: {sys.argv[0]} [ zagreb | wiener ] [ *.bec | *.g6 ]"
+HELP = (
+    f"Usage: {sys.argv[0]} [ zagreb | wiener | degree ] [ *.bec | *.g6 ]"
+    " [ --general ] [ --stream | --top K | --bottom K ] [ --jobs N ]"
+)
 
 """
 cubic graphs: each edge is of degree 3, can't have odd number of edges
-trees:        number of edges is 1 less than number of nodes
+trees:        number of edges is 1 less than number of nodes (and connected),
+              wiener switches to a linear-time path for them unless --general
+
+degree prints Zagreb M1/M2, Randic, ABC, GA, harmonic and sum-connectivity
+indexes computed together from degree and edge arrays (indexes/degree.py).
+
+--stream prints rows in input order as soon as they are computed, --top K
+and --bottom K print only the first/last K rows of the sorted output while
+keeping K rows in memory.
+
+--jobs N splits the file into byte ranges on line boundaries and scores them
+in N processes, the output is the same as with a single process.
 """
 if __name__ == "__main__":
-    if len(sys.argv) < 3:
+    args = sys.argv[1:]
+    general = cli.pop_flag(args, "--general")
+    stream = cli.pop_flag(args, "--stream")
+    top = cli.pop_option(args, "--top", HELP, minimum=0)
+    bottom = cli.pop_option(args, "--bottom", HELP, minimum=0)
+    jobs = cli.pop_option(args, "--jobs", HELP) or 1
+
+    if len(args) < 2:
         raise cli.ArgumentError("Not enough arguments", HELP)
 
-    mode = sys.argv[1]
-    file_path = sys.argv[2]
+    mode = args[0]
+    file_path = args[1]
     ext: str = cli.file_ext(file_path)
 
-    if mode not in ["zagreb", "wiener"]:
+    if mode not in ["zagreb", "wiener", "degree"]:
         raise ArgumentError(f"Wrong mode: '{mode}'.", HELP)
 
     if ext != ".bec" and ext != ".g6":
         raise ArgumentError(f"Wrong file format: '{ext}'.", HELP)
 
+    if top is not None and bottom is not None:
+        raise ArgumentError("Use only one of --top and --bottom.", HELP)
+
+    config = cli.Config(file_path, general, stream, top, bottom, jobs)
+
     match mode:
-        case "zagreb": zagreb.run(cli.Config(file_path))
-        case "wiener": wiener.run(cli.Config(file_path))
+        case "zagreb": zagreb.run(config)
+        case "wiener": wiener.run(config)
+        case "degree": degree.run(config)
         case _: raise Exception("wrong mode")
@@ -0,0 +1,51 @@
+"""Helpers for scoring graph files line by line in bounded memory.
+
+Index iterators read their input in chunks and yield (value, ..., graph
+string) rows as they are computed. `select` decides how many rows are
+kept: all of them sorted (the default), none (streaming in input order)
+or only the top/bottom k through a heap.
+"""
+import heapq
+import itertools
+import sys
+from collections.abc import Iterable, Iterator
+from typing import TextIO
+
+CHUNK_SIZE = 4096
+
+
+def chunked(lines: Iterable[str], size: int = CHUNK_SIZE) -> Iterator[list[str]]:
+    """Groups lines into lists of at most `size` lines."""
+    it = iter(lines)
+    while chunk := list(itertools.islice(it, size)):
+        yield chunk
+
+
+def select(
+    rows: Iterable[tuple],
+    top: int | None = None,
+    bottom: int | None = None,
+    stream: bool = False,
+) -> Iterable[tuple]:
+    """Orders rows the way they are printed.
+
+    The full output is sorted in descending order. `top` and `bottom`
+    return its first or last k rows while keeping only k rows in memory,
+    `stream` returns rows unsorted as they arrive.
+    """
+    if top is not None:
+        return heapq.nlargest(top, rows)
+    if bottom is not None:
+        return reversed(heapq.nsmallest(bottom, rows))
+    if stream:
+        return rows
+    return sorted(rows, reverse=True)
+
+
+def write_rows(rows: Iterable[tuple], out: TextIO = sys.stdout) -> None:
+    """Prints rows as space separated values, the graph string last."""
+    for i, (*values, gs) in enumerate(rows, 1):
+        out.write(" ".join(map(str, values)) + " " + gs.strip() + "\n")
+        if i % CHUNK_SIZE == 0:
+            out.flush()
+    out.flush()
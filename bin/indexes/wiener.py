@@ -1,19 +1,91 @@
 #!/usr/bin/env python3
 import networkx
+import numpy as np
 import sys
+from collections.abc import Iterator
+from functools import partial
 import cli
 from benzenoids import benparse as bp
+from indexes import distance, shard, stream
 
 
 def print_help():
-    print(f"Usage: {sys.argv[0]} [ *.bec | *.g6 ]")
+    print(f"Usage: {sys.argv[0]} [ --reference | --general ] [ *.bec | *.g6 ]")
 
 
-def wiener_index(file_path: str) -> list[tuple[float, str]]:
+def wiener_g6(lines: list[str], general: bool = False) -> np.ndarray:
+    """Calculates Wiener indexes for a list of G6 strings.
+
+    Lines are grouped by graph order and decoded straight into adjacency
+    arrays, each group is handed to the batched distance engine. Trees are
+    detected and computed in linear time unless `general` is set.
+    """
+    w = np.empty(len(lines), dtype=np.float64)
+    for ids in bp.group_by_order(lines).values():
+        for s in range(0, len(ids), distance.BATCH_SIZE):
+            chunk = ids[s:s + distance.BATCH_SIZE]
+            adj = bp.from_g6_batch([lines[i] for i in chunk])
+            w[chunk] = distance.wiener(adj, general)
+    return w
+
+
+def wiener_bec(lines: list[str], general: bool = False) -> np.ndarray:
+    """Calculates Wiener indexes for a list of BEC strings."""
+    adjs = [bp.from_bec_array(bec) for bec in lines]
+    return distance.wiener_stacked(adjs, general)
+
+
+def wiener_lines(
+    lines: list[str], extension: str, general: bool = False
+) -> list[tuple[float, str]]:
+    """Calculates (Wiener index, graph string) rows for a list of lines."""
+    if extension == ".bec":
+        w = wiener_bec(lines, general)
+    elif extension == ".g6":
+        w = wiener_g6(lines, general)
+    else:
+        raise ValueError(
+            "wrong file extension. Consider renaming to '.bec' or '.g6'")
+
+    return list(zip(w.tolist(), lines))
+
+
+def iter_wiener(file_path: str, general: bool = False) -> Iterator[tuple[float, str]]:
+    """Yields (Wiener index, graph string) for each graph in the file.
+
+    The file is read and scored one chunk of lines at a time, rows come out
+    in input order.
+
+    :param file_path: path to file
+    :param general: do not switch to the linear-time path for trees
+    """
+    extension = cli.file_ext(file_path)
+
+    with open(file_path, "r") as f:
+        for lines in stream.chunked(f):
+            yield from wiener_lines(lines, extension, general)
+
+
+def wiener_index(
+    file_path: str, reference: bool = False, general: bool = False
+) -> list[tuple[float, str]]:
     """Calculates Wiener index for each G6 graph stored in the file.
 
     :param file_path: path to file
+    :param reference: use `networkx.wiener_index` instead of the batched
+        distance engine (slow, kept for validation)
+    :param general: do not switch to the linear-time path for trees
     """
+    if reference:
+        return _wiener_index_nx(file_path)
+
+    l = list(iter_wiener(file_path, general))
+    l.sort(reverse=True)
+    return l
+
+
+def _wiener_index_nx(file_path: str) -> list[tuple[float, str]]:
+    """Reference implementation using networkx, one graph at a time."""
     f = open(file_path, "r")
     l: list[tuple[float, str]] = []
 
@@ -36,27 +108,38 @@ def wiener_index(file_path: str) -> list[tuple[float, str]]:
     return l
 
 
-def run(config: cli.Config):
+def run(config: cli.Config, reference: bool = False):
     """ Executes the program logic. """
     ext: str = cli.file_ext(config.file_path)
 
     if ext == ".bec":
-        print("wi bec")
+        print("wi bec", flush=True)
     else:
-        print("wi g6s")
-
-    wiener = wiener_index(config.file_path)
+        print("wi g6s", flush=True)
+
+    if reference:
+        wiener = stream.select(_wiener_index_nx(config.file_path),
+                               config.top, config.bottom, config.stream)
+    elif config.jobs > 1:
+        score = partial(wiener_lines, extension=ext, general=config.general)
+        wiener = shard.sharded_rows(score, config)
+    else:
+        wiener = stream.select(iter_wiener(config.file_path, config.general),
+                               config.top, config.bottom, config.stream)
 
     # gs = graph string
-    for wi, gs in wiener:
-        print(wi, gs.strip())
+    stream.write_rows(wiener)
 
 
 if __name__ == "__main__":
-    if len(sys.argv) < 2:
+    args = sys.argv[1:]
+    reference = cli.pop_flag(args, "--reference")
+    general = cli.pop_flag(args, "--general")
+
+    if len(args) < 1:
         print_help()
         sys.exit(1)
 
-    cfg = cli.Config(file_path=sys.argv[1])
+    cfg = cli.Config(file_path=args[0], general=general)
     print(cfg)
-    run(cfg)
+    run(cfg, reference)
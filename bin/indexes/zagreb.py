@@ -1,7 +1,11 @@
 #!/usr/bin/env python3
+import numpy as np
 import sys
+from collections.abc import Iterator
+from functools import partial
 import cli
 from benzenoids import benparse as bp
+from indexes import shard, stream
 from networkx import Graph
 
 
@@ -25,29 +29,65 @@ def zagreb_2(g: Graph):
     return s
 
 
-def zagreb_index(file_path: str) -> list[tuple[int, int, str]]:
-    """Calculates Zagreb indexes for each G6 graph stored in the file.
+def zagreb_batch(adj: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Calculates Zagreb 1 and 2 indexes for a (B, n, n) adjacency stack."""
+    deg = adj.sum(axis=2, dtype=np.int64)
+    z1 = (deg * deg).sum(axis=1)
+    # every edge is seen from both ends
+    z2 = np.einsum("bi,bij,bj->b", deg, adj, deg) // 2
+    return z1, z2
 
-    :param file_path: path to file
-    """
-    f = open(file_path, "r")
-    l: list[tuple[int, int, str]] = []
 
-    extension = cli.file_ext(file_path)
+def zagreb_g6(lines: list[str]) -> tuple[np.ndarray, np.ndarray]:
+    """Calculates Zagreb indexes for a list of G6 strings, batched by order."""
+    z1 = np.empty(len(lines), dtype=np.int64)
+    z2 = np.empty(len(lines), dtype=np.int64)
+    for ids in bp.group_by_order(lines).values():
+        adj = bp.from_g6_batch([lines[i] for i in ids])
+        z1[ids], z2[ids] = zagreb_batch(adj)
+    return z1, z2
+
 
+def zagreb_bec(lines: list[str]) -> tuple[np.ndarray, np.ndarray]:
+    """Calculates Zagreb indexes for a list of BEC strings, batched by order."""
+    z1 = np.empty(len(lines), dtype=np.int64)
+    z2 = np.empty(len(lines), dtype=np.int64)
+    adjs = [bp.from_bec_array(bec) for bec in lines]
+    for ids, adj in bp.stack_by_order(adjs):
+        z1[ids], z2[ids] = zagreb_batch(adj)
+    return z1, z2
+
+
+def zagreb_lines(lines: list[str], extension: str) -> list[tuple[int, int, str]]:
+    """Calculates (Zagreb 1, Zagreb 2, graph string) rows for a list of lines."""
     if extension == ".bec":
-        for bec in f:
-            g = bp.from_bec(bec)
-            l.append((zagreb_1(g), zagreb_2(g), bec))
+        z1, z2 = zagreb_bec(lines)
     elif extension == ".g6":
-        for g6s in f:
-            g = bp.from_g6(g6s)
-            l.append((zagreb_1(g), zagreb_2(g), g6s))
+        z1, z2 = zagreb_g6(lines)
     else:
         raise ValueError(
             "wrong file extension. Consider renaming to '.bec' or '.g6'")
+    return list(zip(z1.tolist(), z2.tolist(), lines))
+
+
+def iter_zagreb(file_path: str) -> Iterator[tuple[int, int, str]]:
+    """Yields (Zagreb 1, Zagreb 2, graph string) for each graph in the file.
+
+    :param file_path: path to file
+    """
+    extension = cli.file_ext(file_path)
 
-    f.close()
+    with open(file_path, "r") as f:
+        for lines in stream.chunked(f):
+            yield from zagreb_lines(lines, extension)
+
+
+def zagreb_index(file_path: str) -> list[tuple[int, int, str]]:
+    """Calculates Zagreb indexes for each G6 graph stored in the file.
+
+    :param file_path: path to file
+    """
+    l = list(iter_zagreb(file_path))
     l.sort(reverse=True)
     return l
 
@@ -57,15 +97,19 @@ def run(config: cli.Config):
     ext: str = cli.file_ext(config.file_path)
 
     if ext == ".bec":
-        print("z1 z2 bec")
+        print("z1 z2 bec", flush=True)
     else:
-        print("z1 z2 g6s")
+        print("z1 z2 g6s", flush=True)
 
-    zagreb = zagreb_index(config.file_path)
+    if config.jobs > 1:
+        score = partial(zagreb_lines, extension=ext)
+        zagreb = shard.sharded_rows(score, config)
+    else:
+        zagreb = stream.select(iter_zagreb(config.file_path),
+                               config.top, config.bottom, config.stream)
 
     # gs = graph string
-    for z1, z2, gs in zagreb:
-        print(z1, z2, gs.strip())
+    stream.write_rows(zagreb)
 
 
 if __name__ == "__main__":
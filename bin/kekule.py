@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""Counting Kekule structures (perfect matchings) without listing them.
+
+`kekule_count` returns the number of Kekule structures K together with
+the number of structures containing each edge. A bond is fixed double
+when its frequency is K and fixed single when it is 0.
+
+Two engines are used:
+
+- benzenoids (bipartite, every inner face of length 2 mod 4): all
+  perfect matchings have the same sign in the determinant of the
+  biadjacency matrix B, so K = |det B| and the matchings containing edge
+  uv are counted by the cofactor |det B * inv(B)[v, u]|.
+- any other graph: a transfer-matrix DP along a reverse Cuthill-McKee
+  ordering of the vertices. The state after vertex i is the set of later
+  vertices that are already matched, so the number of states is bounded
+  by 2^bandwidth instead of the number of matchings.
+
+The determinant works in floating point, counts beyond 2^53 are only
+approximate there, use `benzenoid=False` to force the exact DP.
+
+When the structures themselves are needed, `iter_kekule_structures`
+enumerates them by backtracking over integer bitmasks.
+"""
+import sys
+from collections import defaultdict
+from collections.abc import Iterator
+import networkx
+import numpy
+from benzenoids.all_benzenoid import compute_faces
+
+Edge = tuple[int, int]
+
+
+def _edge(u, v) -> Edge:
+    return (u, v) if u < v else (v, u)
+
+
+def is_kasteleyn_bipartite(g: networkx.Graph, rotation: dict[int, list[int]]) -> bool:
+    """Checks that the determinant counts Kekule structures of `g`.
+
+    True when `g` is bipartite and all faces of the embedding except the
+    largest (outer) one have length 2 mod 4, as hexagons do.
+    """
+    if not networkx.is_bipartite(g):
+        return False
+    faces = sorted(len(f) for f in compute_faces(rotation))
+    return all(length % 4 == 2 for length in faces[:-1])
+
+
+def count_determinant(g: networkx.Graph) -> tuple[int, dict[Edge, int]]:
+    """Kekule count and edge frequencies of a benzenoid from det and inv of B."""
+    color = networkx.bipartite.color(g)
+    rows = [v for v in g if color[v] == 0]
+    cols = [v for v in g if color[v] == 1]
+    freq = {_edge(u, v): 0 for u, v in g.edges}
+    if len(rows) != len(cols):
+        return 0, freq
+    if not rows:
+        return 1, freq
+
+    r = {v: i for i, v in enumerate(rows)}
+    c = {v: i for i, v in enumerate(cols)}
+    b = numpy.zeros((len(rows), len(cols)))
+    for u, v in g.edges:
+        if color[u] == 1:
+            u, v = v, u
+        b[r[u], c[v]] = 1.0
+
+    det = numpy.linalg.det(b)
+    k = round(abs(det))
+    if k == 0:
+        return 0, freq
+
+    inv = numpy.linalg.inv(b)
+    for u, v in g.edges:
+        if color[u] == 1:
+            u, v = v, u
+        freq[_edge(u, v)] = round(abs(det * inv[c[v], r[u]]))
+    return k, freq
+
+
+def count_transfer(g: networkx.Graph) -> tuple[int, dict[Edge, int]]:
+    """Kekule count and edge frequencies from a transfer-matrix DP."""
+    order = list(networkx.utils.reverse_cuthill_mckee_ordering(g))
+    n = len(order)
+    pos = {v: i for i, v in enumerate(order)}
+    later = [[pos[w] for w in g[v] if pos[w] > i] for i, v in enumerate(order)]
+    freq = {_edge(u, v): 0 for u, v in g.edges}
+    if n % 2 != 0:
+        return 0, freq
+
+    # forward[i][S]: ways to match vertices 0..i-1 leaving later vertices S matched
+    forward: list[dict[int, int]] = [{0: 1}]
+    for i in range(n):
+        bit = 1 << i
+        nxt: dict[int, int] = defaultdict(int)
+        for s, ways in forward[i].items():
+            if s & bit:
+                nxt[s ^ bit] += ways
+                continue
+            for j in later[i]:
+                if not s >> j & 1:
+                    nxt[s | 1 << j] += ways
+        forward.append(nxt)
+
+    k = forward[n].get(0, 0)
+    if k == 0:
+        return 0, freq
+
+    # backward[S]: ways to complete vertices i..n-1 from state S
+    backward: dict[int, int] = {0: 1}
+    for i in range(n - 1, -1, -1):
+        bit = 1 << i
+        prev: dict[int, int] = {}
+        for s, ways in forward[i].items():
+            if s & bit:
+                prev[s] = backward.get(s ^ bit, 0)
+                continue
+            total = 0
+            for j in later[i]:
+                if not s >> j & 1:
+                    rest = backward.get(s | 1 << j, 0)
+                    if rest:
+                        total += rest
+                        freq[_edge(order[i], order[j])] += ways * rest
+            prev[s] = total
+        backward = prev
+
+    return k, freq
+
+
+def _lowest_degree(adj: list[int], alive: int) -> tuple[int, int]:
+    """Returns the alive vertex with the fewest alive neighbours and them."""
+    best, best_nbrs, best_deg = -1, 0, len(adj) + 1
+    rest = alive
+    while rest:
+        low = rest & -rest
+        rest ^= low
+        v = low.bit_length() - 1
+        nbrs = adj[v] & alive
+        d = nbrs.bit_count()
+        if d < best_deg:
+            best, best_nbrs, best_deg = v, nbrs, d
+            if d <= 1:
+                break  # dead end or forced edge, nothing can be better
+    return best, best_nbrs
+
+
+def iter_kekule_structures(g: networkx.Graph) -> Iterator[list[Edge]]:
+    """Yields every Kekule structure of `g` as a list of edges.
+
+    Vertices are bits of an integer: the unmatched vertices form the mask
+    `alive` and neighbourhoods are masks in `adj`, so taking or undoing an
+    edge is a bit operation and the graph is never copied. Every step
+    branches on the alive vertex of lowest degree over its neighbours, a
+    vertex of degree 1 is therefore matched without branching (forced
+    edge) and a vertex of degree 0 ends the branch at once.
+    """
+    nodes = list(g)
+    n = len(nodes)
+    if n % 2 != 0:
+        return
+    if n == 0:
+        yield []
+        return
+
+    index = {v: i for i, v in enumerate(nodes)}
+    adj = [0] * n
+    for u, v in g.edges:
+        if u != v:
+            adj[index[u]] |= 1 << index[v]
+            adj[index[v]] |= 1 << index[u]
+
+    alive = (1 << n) - 1
+    matching: list[tuple[int, int]] = []
+    # one frame per matched vertex: [vertex, neighbours not tried yet]
+    stack: list[list[int]] = []
+
+    v, cand = _lowest_degree(adj, alive)
+    if cand:
+        stack.append([v, cand])
+
+    while stack:
+        frame = stack[-1]
+        v, cand = frame
+        if len(matching) == len(stack):
+            _, w = matching.pop()
+            alive |= 1 << v | 1 << w
+        if not cand:
+            stack.pop()
+            continue
+
+        low = cand & -cand
+        frame[1] = cand ^ low
+        w = low.bit_length() - 1
+        matching.append((v, w))
+        alive &= ~(1 << v | low)
+
+        if not alive:
+            yield [(nodes[a], nodes[b]) for a, b in matching]
+            continue
+        u, nbrs = _lowest_degree(adj, alive)
+        if nbrs:
+            stack.append([u, nbrs])
+
+
+def kekule_count(
+    g: networkx.Graph,
+    rotation: dict[int, list[int]] | None = None,
+    benzenoid: bool | None = None,
+) -> tuple[int, dict[Edge, int]]:
+    """Returns the number of Kekule structures and per-edge frequencies.
+
+    :param rotation: planar embedding, used to decide whether the
+        determinant engine applies
+    :param benzenoid: force (True) or forbid (False) the determinant engine
+    """
+    if benzenoid is None:
+        benzenoid = rotation is not None and is_kasteleyn_bipartite(g, rotation)
+    if benzenoid:
+        return count_determinant(g)
+    return count_transfer(g)
+
+
+def fixed_bonds(
+    g: networkx.Graph, rotation: dict[int, list[int]] | None = None
+) -> tuple[int, list[Edge], list[Edge]]:
+    """Returns K and the fixed double and fixed single bonds of `g`."""
+    k, freq = kekule_count(g, rotation)
+    if k == 0:
+        return 0, [], []
+    double = sorted(e for e, f in freq.items() if f == k)
+    single = sorted(e for e, f in freq.items() if f == 0)
+    return k, double, single
+
+
+if __name__ == "__main__":
+    from benzenoids.planar_code import read_plc
+
+    if len(sys.argv) < 2:
+        print(f"Usage: {sys.argv[0]} <plc-code>")
+        sys.exit(1)
+
+    for g_adj in read_plc(sys.argv[1]):
+        g = networkx.Graph(g_adj)
+        k, double, single = fixed_bonds(g, g_adj)
+        g6 = networkx.to_graph6_bytes(g, header=False).decode().strip()
+        print(g6, k, len(double), len(single))
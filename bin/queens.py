@@ -1,10 +1,41 @@
 #!/usr/bin/env python3
+"""The n-queens problem solved three ways.
+
+- `ilp`: the integer program below, solved with PuLP (CBC by default).
+  Every diagonal constraint lists its own cells, so building the model
+  takes O(n^2) time.
+- `backtrack`: depth-first search over rows with the free columns and
+  diagonals kept as integer bitmasks, it can also count all solutions.
+- `construct`: the explicit solution of Hoffman, Loessi and Moore, O(n).
+
+Usage:
+    python3 queens.py [ N ] [ --solver ilp | backtrack | construct ]
+                      [ --ilp-solver NAME ] [ --count ] [ --quiet ]
+
+--count prints the number of all solutions (by backtracking), --quiet
+leaves out the board. --ilp-solver is any solver in
+`pulp.listSolvers(onlyAvailable=True)`.
+"""
+import sys
+import time
 import pulp
+import cli
 
 # Documentation: https://coin-or.github.io/pulp/
 
+SOLVERS = ("ilp", "backtrack", "construct")
+HELP = (
+    f"Usage: {sys.argv[0]} [ N ] [ --solver {' | '.join(SOLVERS)} ]"
+    " [ --ilp-solver NAME ] [ --count ] [ --quiet ]"
+)
+
+
+def solve_nqueens(n=8, solver=None):
+    """Solves n-queens as an ILP, returns the column of the queen in every
+    row (None when the solver found no solution).
 
-def solve_nqueens(n=8):
+    :param solver: a PuLP solver, CBC without output by default
+    """
     model = pulp.LpProblem("nQueens", pulp.LpMaximize)  # Create MILP model
 
     # Binary variables: x[i][j] = 1 if a queen is at (i,j)
@@ -19,27 +50,130 @@ def solve_nqueens(n=8):
     # One queen per column
     for j in range(n):
         model += pulp.lpSum(x[i][j] for i in range(n)) == 1
-    # Main diagonals (i - j constant)
+    # Main diagonals (i - j = d), cells with both coordinates on the board
     for d in range(-n + 1, n):
-        model += pulp.lpSum(x[i][j] for i in range(n) for j in range(n) if i - j == d) <= 1
-    # Anti-diagonals (i + j constant)
+        model += pulp.lpSum(x[i][i - d] for i in range(max(0, d), min(n, n + d))) <= 1
+    # Anti-diagonals (i + j = d)
     for d in range(2 * n - 1):
-        model += pulp.lpSum(x[i][j] for i in range(n) for j in range(n) if i + j == d) <= 1
+        model += pulp.lpSum(x[i][d - i] for i in range(max(0, d - n + 1), min(n, d + 1))) <= 1
 
-    model.solve(pulp.PULP_CBC_CMD(msg=False))  # Solve using PuLP's default solver
+    model.solve(solver or pulp.PULP_CBC_CMD(msg=False))
+    if model.status != pulp.LpStatusOptimal:
+        return None
+    return [next(j for j in range(n) if pulp.value(x[i][j]) > 0.5) for i in range(n)]
+
+
+def _backtrack(n, row, cols, diag, anti, placed, count_all):
+    """Places queens from `row` on, returns the number of solutions found.
+
+    Bit j of `cols` is set when column j is taken, bit j of `diag`/`anti`
+    when the diagonal through (row, j) is attacked. These masks shift by
+    one column per row.
+    """
+    if row == n:
+        return 1
+    full = (1 << n) - 1
+    found = 0
+    free = full & ~(cols | diag | anti)
+    while free:
+        bit = free & -free
+        free ^= bit
+        placed.append(bit.bit_length() - 1)
+        found += _backtrack(n, row + 1, cols | bit, ((diag | bit) << 1) & full,
+                            (anti | bit) >> 1, placed, count_all)
+        if found and not count_all:
+            return found
+        placed.pop()
+    return found
+
+
+def backtrack_nqueens(n=8):
+    """Returns the first solution found by backtracking, None when there is none."""
+    placed = []
+    sys.setrecursionlimit(max(sys.getrecursionlimit(), n + 100))
+    return placed if _backtrack(n, 0, 0, 0, 0, placed, False) else None
+
+
+def count_nqueens(n=8):
+    """Counts all solutions by backtracking.
+
+    Solutions with the first queen in the right half are mirror images of
+    those in the left half, so only the left half (and the middle column
+    for odd n) is searched.
+    """
+    full = (1 << n) - 1
+    total = 0
+    for j in range((n + 1) // 2):
+        bit = 1 << j
+        found = _backtrack(n, 1, bit, (bit << 1) & full, bit >> 1, [], True)
+        total += found if 2 * j + 1 == n else 2 * found
+    return total
+
+
+def construct_nqueens(n=8):
+    """Returns the explicit solution for n, None for n = 2 and 3 (no solution)."""
+    if n in (2, 3):
+        return None
+    evens = list(range(2, n + 1, 2))
+    odds = list(range(1, n + 1, 2))
+    if n % 6 == 2:
+        odds = [3, 1] + odds[3:] + [5]
+    elif n % 6 == 3:
+        evens = evens[1:] + [2]
+        odds = odds[2:] + [1, 3]
+    # queen in column k (1-based) stands in row rows[k - 1]
+    rows = evens + odds
+    cols = [0] * n
+    for j, i in enumerate(rows):
+        cols[i - 1] = j
+    return cols
+
+
+def is_solution(cols):
+    """Checks that no two queens attack each other."""
+    n = len(cols)
+    return (len(set(cols)) == n
+            and len({i - j for i, j in enumerate(cols)}) == n
+            and len({i + j for i, j in enumerate(cols)}) == n)
+
+
+def print_board(cols):
+    for j in cols:
+        print(' '.join('Q' if k == j else '.' for k in range(len(cols))))
 
-    # Extract and print solution
-    board = [['.' for _ in range(n)] for _ in range(n)]
-    for i in range(n):
-        for j in range(n):
-            if pulp.value(x[i][j]) == 1:
-                board[i][j] = 'Q'
 
-    for row in board:
-        print(' '.join(row))
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    method = cli.pop_value(args, "--solver", HELP) or "ilp"
+    ilp_solver = cli.pop_value(args, "--ilp-solver", HELP)
+    count = cli.pop_flag(args, "--count")
+    quiet = cli.pop_flag(args, "--quiet")
+    if method not in SOLVERS:
+        raise cli.ArgumentError(f"Unknown solver '{method}'.", HELP)
+    if len(args) > 1 or (args and not args[0].isdigit()):
+        raise cli.ArgumentError("Expected the board size.", HELP)
+    n = int(args[0]) if args else 8
 
-    print("\nStatus:", pulp.LpStatus[model.status])
-    print("Objective (number of queens):", pulp.value(model.objective))
+    start = time.perf_counter()
+    if method == "ilp":
+        solver = pulp.getSolver(ilp_solver, msg=False) if ilp_solver else None
+        cols = solve_nqueens(n, solver)
+    elif method == "backtrack":
+        cols = backtrack_nqueens(n)
+    else:
+        cols = construct_nqueens(n)
+    elapsed = time.perf_counter() - start
 
+    if cols is None:
+        print("No solution")
+    else:
+        if not quiet:
+            print_board(cols)
+            print()
+        print("Queens:", len(cols), "valid" if is_solution(cols) else "INVALID")
+    print(f"Time ({method}): {elapsed:.3f} s")
 
-solve_nqueens(8)  # Example: 8 queens
+    if count:
+        start = time.perf_counter()
+        print("Solutions:", count_nqueens(n))
+        print(f"Time (count): {time.perf_counter() - start:.3f} s")
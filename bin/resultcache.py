@@ -0,0 +1,169 @@
+"""Persistent cache of per-graph results keyed by canonical graph identity.
+
+Results are rows of a single SQLite file. The key of a row is a blake2b
+digest of the analysis name, its version and the identity of the graph.
+Every result is stored under the exact input string, so a run over lines
+that were seen before only looks them up. Analyses may also pass a
+canonical form, then results are stored under it as well and relabelled
+copies of a graph share one entry; canonical forms are computed only for
+the lines missing under their exact string.
+
+A lookup costs about as much as a batched NumPy index, so the cache is
+only used by analyses that are much slower per graph: Clar and Fries
+numbers (`benzenoids/clar.py`, one CBC solve each), keyed by canonical
+BECs (`canonical.canonical_bec`).
+
+Every lookup marks the rows it hits as used. When the file holds more
+than `max_entries` rows the least recently used ones are deleted.
+
+The cache is off unless the `MATKEM_CACHE` environment variable names
+its file (scripts set it from `--cache FILE`, worker processes inherit
+it), `MATKEM_CACHE_SIZE` overrides the default number of entries.
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from collections.abc import Callable, Sequence
+
+ENV = "MATKEM_CACHE"
+ENV_SIZE = "MATKEM_CACHE_SIZE"
+DEFAULT_MAX_ENTRIES = 1_000_000
+# share of `max_entries` kept after an eviction, so evictions are rare
+KEEP_AFTER_EVICTION = 0.9
+# keys per SQL statement, below SQLite's limit on host parameters
+BATCH_SIZE = 512
+
+Value = tuple
+Compute = Callable[[list[int]], list[Value]]
+
+def _key(analysis: str, version: int, identity: str) -> bytes:
+    return hashlib.blake2b(f"{analysis}\0{version}\0{identity}".encode(),
+                           digest_size=16).digest()
+
+
+class ResultCache:
+    """Results of analyses in the SQLite file `path`.
+
+    :param path: cache file, created when missing
+    :param max_entries: number of rows kept by LRU eviction
+    """
+
+    def __init__(self, path: str, max_entries: int = DEFAULT_MAX_ENTRIES) -> None:
+        self.path = path
+        self.max_entries = max_entries
+        self.db = sqlite3.connect(path, timeout=60)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS results"
+            " (key BLOB PRIMARY KEY, value TEXT NOT NULL, used INTEGER NOT NULL)"
+            " WITHOUT ROWID")
+        self.db.execute("CREATE INDEX IF NOT EXISTS results_used ON results (used)")
+        self.db.commit()
+
+    def get_many(self, keys: Sequence[bytes]) -> list[Value | None]:
+        """Returns the values of keys (None for missing ones), marks hits as used."""
+        found: dict[bytes, Value] = {}
+        for s in range(0, len(keys), BATCH_SIZE):
+            chunk = list(set(keys[s:s + BATCH_SIZE]))
+            marks = ",".join("?" * len(chunk))
+            for key, value in self.db.execute(
+                    f"SELECT key, value FROM results WHERE key IN ({marks})", chunk):
+                found[key] = tuple(json.loads(value))
+        if found:
+            now = time.time_ns()
+            self.db.executemany("UPDATE results SET used = ? WHERE key = ?",
+                                ((now, key) for key in found))
+            self.db.commit()
+        return [found.get(key) for key in keys]
+
+    def put_many(self, keys: Sequence[bytes], values: Sequence[Value]) -> None:
+        """Stores values under keys and evicts the least recently used rows."""
+        now = time.time_ns()
+        self.db.executemany(
+            "INSERT OR REPLACE INTO results (key, value, used) VALUES (?, ?, ?)",
+            ((key, json.dumps(value), now) for key, value in zip(keys, values)))
+        (count,) = self.db.execute("SELECT COUNT(*) FROM results").fetchone()
+        if count > self.max_entries:
+            self.db.execute(
+                "DELETE FROM results WHERE key IN"
+                " (SELECT key FROM results ORDER BY used LIMIT ?)",
+                (count - int(self.max_entries * KEEP_AFTER_EVICTION),))
+        self.db.commit()
+
+    def __len__(self) -> int:
+        return self.db.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+    def close(self) -> None:
+        self.db.close()
+
+
+# the cache of this process and the pid that opened it, a connection
+# inherited by a forked worker must not be used there
+_cache: ResultCache | None = None
+_owner: int | None = None
+
+
+def enable(path: str) -> None:
+    """Turns the cache on for this process and the processes it starts."""
+    os.environ[ENV] = path
+
+
+def open_cache() -> ResultCache | None:
+    """Returns the cache named by `MATKEM_CACHE`, None when it is off."""
+    global _cache, _owner
+    path = os.environ.get(ENV)
+    if not path:
+        return None
+    if _cache is None or _owner != os.getpid() or _cache.path != path:
+        size = int(os.environ.get(ENV_SIZE, DEFAULT_MAX_ENTRIES))
+        _cache, _owner = ResultCache(path, size), os.getpid()
+    return _cache
+
+
+def cached(
+    analysis: str,
+    version: int,
+    graphs: Sequence[str],
+    compute: Compute,
+    canonical_form: Callable[[str], str] | None = None,
+) -> list[Value]:
+    """Returns the values of an analysis for graphs, computing only the
+    ones missing in the cache.
+
+    :param analysis: name of the analysis, part of every key
+    :param version: bumped whenever the analysis changes its results
+    :param graphs: graph strings (g6 or BEC)
+    :param compute: returns values for a list of indexes into `graphs`
+    :param canonical_form: canonical string of a graph, None when the
+        values depend on the labelling and only exact strings may match
+    """
+    cache = open_cache()
+    if cache is None:
+        return compute(list(range(len(graphs))))
+
+    exact = [_key(analysis, version, "=" + g.strip()) for g in graphs]
+    values = cache.get_many(exact)
+    missing = [i for i, v in enumerate(values) if v is None]
+    if not missing:
+        return values
+
+    canon: dict[int, bytes] = {}
+    if canonical_form is not None:
+        canon = {i: _key(analysis, version, canonical_form(graphs[i])) for i in missing}
+        hits = cache.get_many([canon[i] for i in missing])
+        for i, v in zip(missing, hits):
+            values[i] = v
+        found = [i for i, v in zip(missing, hits) if v is not None]
+        cache.put_many([exact[i] for i in found], [values[i] for i in found])
+        missing = [i for i in missing if values[i] is None]
+
+    if missing:
+        for i, v in zip(missing, compute(missing)):
+            values[i] = tuple(v)
+        stored = [(exact[i], values[i]) for i in missing]
+        stored += [(canon[i], values[i]) for i in missing if i in canon]
+        cache.put_many([key for key, _ in stored], [value for _, value in stored])
+    return values
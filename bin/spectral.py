@@ -0,0 +1,165 @@
+"""Spectra of large sparse graphs without the full eigendecomposition.
+
+Adjacency matrices are built as SciPy CSR arrays straight from parsed
+graphs: edge arrays (`benparse.from_g6_edges`, `benparse.from_bec_edges`),
+planar_code rotation arrays, (n, d) neighbour arrays of regular graphs
+(`writegraph3d`), 1-based neighbour dicts or networkx graphs.
+
+Only the eigenpairs that are asked for are computed with Lanczos
+(`scipy.sparse.linalg.eigsh`):
+
+- `top_k` / `bottom_k`: the k largest / smallest eigenvalues,
+- `homo_lumo`: a window of eigenvalues around the HOMO and LUMO, found by
+  shift-invert near 0 and placed in the spectrum by counting eigenvalues
+  above the shift and past both ends of the window (Sylvester's law of
+  inertia on an LDL^T factorization), so that repeated eigenvalues with
+  copies missing from the window are caught.
+
+This costs about O(nk) per graph instead of O(n^3). Graphs with at most
+`DENSE_LIMIT` vertices, where Lanczos does not pay off, and requests for
+most of the spectrum go to dense `numpy.linalg.eigh` instead.
+"""
+import math
+import networkx as nx
+import numpy as np
+from scipy import sparse
+from scipy.sparse import linalg
+
+DENSE_LIMIT = 200
+# shift for the HOMO-LUMO window, off 0 so that it is not an eigenvalue
+# of the many graphs with a zero eigenvalue
+SHIFT = 1e-3 * math.pi
+# eigenvalues closer than this to an end of the window count as equal to it
+TOLERANCE = 1e-8
+
+Eigenpairs = tuple[np.ndarray, np.ndarray]
+
+
+def from_edges(n: int, edges: np.ndarray) -> sparse.csr_array:
+    """Builds a CSR adjacency matrix from an (m, 2) array of 0-based edges."""
+    edges = np.asarray(edges, dtype=np.int64).reshape(-1, 2)
+    rows = np.concatenate([edges[:, 0], edges[:, 1]])
+    cols = np.concatenate([edges[:, 1], edges[:, 0]])
+    data = np.ones(len(rows), dtype=np.float64)
+    a = sparse.csr_array((data, (rows, cols)), shape=(n, n))
+    a.sum_duplicates()
+    a.data[:] = 1.0
+    return a
+
+
+def from_rotation(indptr: np.ndarray, nbrs: np.ndarray) -> sparse.csr_array:
+    """Builds a CSR adjacency matrix from planar_code rotation arrays."""
+    n = len(indptr) - 1
+    a = sparse.csr_array(
+        (np.ones(len(nbrs), dtype=np.float64), nbrs.astype(np.int64), indptr), shape=(n, n))
+    a.sum_duplicates()
+    a.data[:] = 1.0
+    return a
+
+
+def from_neighbours(nbrs: np.ndarray) -> sparse.csr_array:
+    """Builds a CSR adjacency matrix from an (n, d) array of 0-based neighbours."""
+    n, d = nbrs.shape
+    return from_rotation(np.arange(0, n * d + 1, d, dtype=np.int64), nbrs.ravel())
+
+
+def from_dict(g: dict[int, list[int]]) -> sparse.csr_array:
+    """Builds a CSR adjacency matrix from 1-based neighbour lists."""
+    indptr = np.zeros(len(g) + 1, dtype=np.int64)
+    np.cumsum([len(g[u]) for u in range(1, len(g) + 1)], out=indptr[1:])
+    nbrs = np.fromiter((v - 1 for u in range(1, len(g) + 1) for v in g[u]),
+                       dtype=np.int64, count=int(indptr[-1]))
+    return from_rotation(indptr, nbrs)
+
+
+def from_graph(g: nx.Graph) -> sparse.csr_array:
+    """Builds a CSR adjacency matrix of a networkx graph (nodes in `g` order)."""
+    return nx.to_scipy_sparse_array(g, format="csr", dtype=np.float64)
+
+
+def spectrum(a: sparse.csr_array) -> Eigenpairs:
+    """All eigenvalues (ascending) and eigenvectors, computed densely."""
+    return np.linalg.eigh(a.toarray())
+
+
+def _dense(a: sparse.csr_array, k: int) -> bool:
+    n = a.shape[0]
+    return n <= DENSE_LIMIT or 2 * k >= n
+
+
+def top_k(a: sparse.csr_array, k: int) -> Eigenpairs:
+    """The k largest eigenvalues (descending) and their eigenvectors."""
+    if _dense(a, k):
+        values, vectors = spectrum(a)
+        return values[::-1][:k], vectors[:, ::-1][:, :k]
+    values, vectors = linalg.eigsh(a, k=k, which="LA")
+    order = np.argsort(values)[::-1]
+    return values[order], vectors[:, order]
+
+
+def bottom_k(a: sparse.csr_array, k: int) -> Eigenpairs:
+    """The k smallest eigenvalues (ascending) and their eigenvectors."""
+    if _dense(a, k):
+        values, vectors = spectrum(a)
+        return values[:k], vectors[:, :k]
+    values, vectors = linalg.eigsh(a, k=k, which="SA")
+    order = np.argsort(values)
+    return values[order], vectors[:, order]
+
+
+def count_above(a: sparse.csr_array, sigma: float) -> int | None:
+    """Returns the number of eigenvalues greater than `sigma`.
+
+    By Sylvester's law of inertia this is the number of negative pivots of
+    an LDL^T factorization of sigma*I - A. The factorization is a sparse LU
+    in symmetric mode without pivoting, None when pivoting was needed.
+    """
+    n = a.shape[0]
+    m = (sigma * sparse.identity(n, format="csc") - a).tocsc()
+    try:
+        lu = linalg.splu(m, permc_spec="MMD_AT_PLUS_A", diag_pivot_thresh=0.0,
+                         options={"SymmetricMode": True})
+    except RuntimeError:
+        return None
+    if not np.array_equal(lu.perm_r, lu.perm_c):
+        return None
+    return int((lu.U.diagonal() < 0).sum())
+
+
+def homo_lumo(a: sparse.csr_array, width: int = 4) -> tuple[float, float]:
+    """Returns the HOMO and LUMO eigenvalues of a graph.
+
+    With eigenvalues in descending order l_1 >= ... >= l_n the HOMO is the
+    ceil(n / 2)-th and the LUMO the (floor(n / 2) + 1)-th, so both are the
+    same orbital when n is odd.
+
+    :param width: initial number of eigenvalues in the window around 0,
+        doubled until it covers both orbitals
+    """
+    n = a.shape[0]
+    h, l = (n + 1) // 2, n // 2 + 1
+    if n == 0:
+        return math.nan, math.nan
+
+    k = width
+    while not _dense(a, k):
+        above = count_above(a, SHIFT)
+        if above is None:
+            break
+        values = np.sort(linalg.eigsh(a, k=k, sigma=SHIFT, which="LM",
+                                      return_eigenvectors=False))[::-1]
+        # values[j] is the (first + j)-th largest eigenvalue of the graph
+        # only when Lanczos found every copy of a repeated eigenvalue, so
+        # the inertia at both ends of the window must agree with it
+        first = above - int((values > SHIFT).sum()) + 1
+        top = count_above(a, values[0] + TOLERANCE)
+        bottom = count_above(a, values[-1] - TOLERANCE)
+        if top is None or bottom is None:
+            break
+        if (top == first - 1 and bottom == first + len(values) - 1
+                and first <= h and l < first + len(values)):
+            return float(values[h - first]), float(values[l - first])
+        k *= 2
+
+    values = np.linalg.eigvalsh(a.toarray())[::-1]
+    return float(values[h - 1]), float(values[l - 1])
@@ -0,0 +1,17 @@
+import pytest
+from benzenoids import benparse as bp
+
+
+def test_bec_lattice_naphthalene():
+    coords, edges, centers = bp.bec_lattice("55")
+    assert (len(coords), len(edges), len(centers)) == (10, 11, 2)
+
+
+def test_bec_lattice_rejects_counter_clockwise():
+    with pytest.raises(ValueError):
+        bp.bec_lattice("111111")
+
+
+def test_bec_lattice_benzene():
+    coords, edges, centers = bp.bec_lattice("6")
+    assert (len(coords), len(edges), len(centers)) == (6, 6, 1)
@@ -0,0 +1,13 @@
+import pytest
+from benzenoids import benzenoid_symmetry as bs
+
+
+def test_parse_args():
+    assert bs.parse_args(["in.bec", "--jobs", "4", "--progress"]) == (["in.bec"], 4, True)
+    assert bs.parse_args([]) == ([], 1, False)
+
+
+@pytest.mark.parametrize("args", [["--jobs"], ["--jobs", "x"], ["--jobs", "0"], ["a", "b"]])
+def test_parse_args_rejects(args):
+    with pytest.raises(SystemExit):
+        bs.parse_args(args)
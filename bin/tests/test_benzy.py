@@ -0,0 +1,10 @@
+from benzenoids import benparse as bp
+from benzenoids.benzenoid_symmetry import point_group
+from benzenoids.benzy import Benzy
+
+
+def test_benzene():
+    # the code all_benzenoid --bec writes for benzene
+    b = Benzy(bp.BENZENE)
+    assert (len(b.vertices), b.graph.number_of_edges()) == (6, 6)
+    assert point_group(bp.BENZENE) == "D6h"
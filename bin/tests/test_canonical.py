@@ -0,0 +1,71 @@
+import random
+from pathlib import Path
+import networkx as nx
+import pytest
+import canonical
+
+DATA = Path(__file__).resolve().parent.parent.parent / "data"
+
+
+def _g6(g: nx.Graph) -> str:
+    return nx.to_graph6_bytes(nx.convert_node_labels_to_integers(g), header=False).decode().strip()
+
+
+def _relabelled(g: nx.Graph, seed: int) -> nx.Graph:
+    nodes = list(g)
+    shuffled = nodes[:]
+    random.Random(seed).shuffle(shuffled)
+    return nx.relabel_nodes(g, dict(zip(nodes, shuffled)))
+
+
+def _shrikhande() -> nx.Graph:
+    steps = [(0, 1), (1, 0), (1, 1), (0, 3), (3, 0), (3, 3)]
+    return nx.Graph(((a, b), ((a + da) % 4, (b + db) % 4))
+                    for a in range(4) for b in range(4) for da, db in steps)
+
+
+SYMMETRIC = {
+    "petersen": nx.petersen_graph(),
+    "desargues": nx.desargues_graph(),
+    "moebius_kantor": nx.moebius_kantor_graph(),
+    "paley13": nx.Graph(nx.paley_graph(13).to_undirected()),
+    "shrikhande": _shrikhande(),
+}
+
+
+@pytest.mark.parametrize("name", sorted(SYMMETRIC))
+def test_relabelling_invariance_symmetric(name):
+    g = SYMMETRIC[name]
+    form = canonical.canonical_g6(_g6(g))
+    for seed in range(5):
+        assert canonical.canonical_g6(_g6(_relabelled(g, seed))) == form
+
+
+def test_relabelling_invariance_random():
+    rng = random.Random(13)
+    for k in range(300):
+        n = rng.randrange(2, 16)
+        g = nx.gnp_random_graph(n, rng.uniform(0.1, 0.9), seed=k)
+        assert canonical.canonical_g6(_g6(_relabelled(g, k))) == canonical.canonical_g6(_g6(g))
+
+
+def test_strongly_regular_pair():
+    # both are srg(16, 6, 2, 2) and not isomorphic
+    rook = nx.cartesian_product(nx.complete_graph(4), nx.complete_graph(4))
+    shrikhande = _shrikhande()
+    for g in (rook, shrikhande):
+        assert len(g) == 16 and {d for _, d in g.degree} == {6}
+    assert canonical.canonical_g6(_g6(rook)) != canonical.canonical_g6(_g6(shrikhande))
+
+
+@pytest.mark.parametrize("file_name, classes", [
+    ("cubic12.g6", 85), ("cubic14.g6", 509), ("tree12.g6", 551),
+])
+def test_class_counts(file_name, classes):
+    # every file lists each isomorphism class once, relabelled copies added
+    lines = [s for s in (DATA / file_name).read_text().split() if s]
+    forms = {canonical.canonical_g6(s) for s in lines}
+    copies = {canonical.canonical_g6(_g6(_relabelled(nx.from_graph6_bytes(s.encode()), i)))
+              for i, s in enumerate(lines[:50])}
+    assert len(forms) == classes
+    assert copies <= forms
@@ -0,0 +1,40 @@
+from pathlib import Path
+import pytest
+from benzenoids import clar
+
+DATA = Path(__file__).resolve().parent.parent.parent / "data"
+
+KNOWN = [
+    ("55", "1", "2"),  # naphthalene
+    ("5351", "2", "3"),  # phenanthrene
+    ("515151", "3", "4"),  # triphenylene
+    ("333333", "3", "6"),  # coronene
+    ("4343", "2", "3"),  # pyrene
+    ("444", "-", "-"),  # phenalene, no Kekule structure
+]
+
+
+@pytest.mark.parametrize("bec, clar_number, fries_number", KNOWN)
+def test_known_values(bec, clar_number, fries_number):
+    number, fries, sextets, _ = clar._solve_task((clar.from_bec(bec), bec))
+    assert (number, fries) == (clar_number, fries_number)
+    if number != "-":
+        assert len(sextets.split(",")) == int(number)
+
+
+def test_reused_models(tmp_path):
+    # benzenoids of the same size share one model per process, solved in a
+    # row they must not see each other's constraints
+    becs = [bec for bec, _, _ in KNOWN] * 2
+    path = tmp_path / "known.bec"
+    path.write_text("\n".join(becs) + "\n")
+    rows = list(clar.solve_file(str(path)))
+    assert [row[:2] for row in rows] == [(c, f) for _, c, f in KNOWN] * 2
+
+
+def test_planar_code():
+    rows = list(clar.solve_file(str(DATA / "b3.plc")))
+    assert [row[:2] for row in rows] == [("1", "2"), ("2", "3"), ("-", "-")]
+    assert [row[3] for row in rows] == ["2525", "1535", "444"]
+    # phenanthrene: the two outer hexagons, not the middle one
+    assert rows[1][2] == "1,2"
@@ -0,0 +1,16 @@
+import pytest
+import cli
+
+
+def test_pop_option():
+    args = ["in.g6", "--jobs", "4", "--top", "0"]
+    assert cli.pop_option(args, "--jobs", "") == 4
+    assert cli.pop_option(args, "--top", "", minimum=0) == 0
+    assert cli.pop_option(args, "--bottom", "") is None
+    assert args == ["in.g6"]
+
+
+@pytest.mark.parametrize("value, minimum", [("-2", 1), ("0", 1), ("-3", 0), ("x", 1)])
+def test_pop_option_rejects(value, minimum, capsys):
+    with pytest.raises(cli.ArgumentError):
+        cli.pop_option(["--jobs", value], "--jobs", "usage", minimum)
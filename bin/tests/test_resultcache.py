@@ -0,0 +1,48 @@
+import pytest
+import resultcache
+from benzenoids import clar
+
+
+def test_lru_eviction(tmp_path):
+    cache = resultcache.ResultCache(str(tmp_path / "cache.db"), max_entries=10)
+    keys = [bytes([i]) for i in range(10)]
+    cache.put_many(keys, [(i,) for i in range(10)])
+    cache.get_many(keys[5:])
+    cache.put_many([b"new"], [("new",)])
+    assert len(cache) == 9
+    assert cache.get_many(keys[5:] + [b"new"]) == [(i,) for i in range(5, 10)] + [("new",)]
+    cache.close()
+
+
+def _disjoint_sextets(row):
+    number, _, sextets, bec = row
+    hexagons = clar.from_bec(bec).hexagon_vertices
+    vertices = [v for h in sextets.split(",") for v in hexagons[int(h)].tolist()]
+    return len(vertices) == len(set(vertices)) == 6 * int(number)
+
+
+def test_clar_rows_from_cache(tmp_path, monkeypatch):
+    monkeypatch.setenv(resultcache.ENV, str(tmp_path / "cache.db"))
+    first = tmp_path / "first.bec"
+    first.write_text("5351\n55\n")
+    solved = list(clar.solve_file(str(first)))
+    assert list(clar.solve_file(str(first))) == solved
+
+    def fail(task):
+        raise AssertionError(f"{task[1]} was solved again")
+
+    # rotated and mirrored codes of the same benzenoids are only looked up
+    monkeypatch.setattr(clar, "_solve_task", fail)
+    second = tmp_path / "second.bec"
+    second.write_text("1535\n5153\n55\n")
+    rows = list(clar.solve_file(str(second)))
+    assert [row[:2] for row in rows] == [("2", "3"), ("2", "3"), ("1", "2")]
+    assert all(_disjoint_sextets(row) for row in rows)
+
+
+@pytest.mark.parametrize("bec", ["5351", "4343", "2225222252", "6"])
+def test_hexagon_map_is_a_bijection(bec):
+    mirrored = bec[::-1]
+    for k in range(len(bec)):
+        index = clar.hexagon_map(mirrored[k:] + mirrored[:k], bec)
+        assert sorted(index) == list(range(len(index)))
@@ -0,0 +1,23 @@
+import networkx as nx
+import numpy as np
+import pytest
+import spectral
+
+
+@pytest.mark.parametrize("n", [901, 1001])
+def test_homo_lumo_large_nullity(n):
+    # trees with a zero eigenvalue of multiplicity over 100, more than
+    # shift-invert Lanczos returns in its first windows
+    a = spectral.from_graph(nx.random_labeled_tree(n, seed=n))
+    values = np.linalg.eigvalsh(a.toarray())[::-1]
+    homo, lumo = spectral.homo_lumo(a)
+    assert homo == pytest.approx(values[(n + 1) // 2 - 1], abs=1e-8)
+    assert lumo == pytest.approx(values[n // 2], abs=1e-8)
+
+
+def test_homo_lumo_path():
+    n = 401
+    a = spectral.from_graph(nx.path_graph(n))
+    values = np.linalg.eigvalsh(a.toarray())[::-1]
+    assert spectral.homo_lumo(a) == pytest.approx(
+        (values[(n + 1) // 2 - 1], values[n // 2]), abs=1e-8)